@@ -1,6 +1,17 @@
 # Import necessary libraries
-from flask import Flask, request, render_template, jsonify  # Flask modules for web app functionality
-from src.pipelines.prediction_pipeline import CustomData, PredictPipeline  # Custom classes for data handling and prediction
+import io  # Buffers the Arrow IPC response between streamed batches
+import os  # Used to read the serving configuration from the environment
+import time  # Used to measure the warm-up time
+import numpy as np  # Builds the validity mask of the Arrow predictions
+from flask import Flask, Response, request, render_template, jsonify, stream_with_context, g  # Flask modules for web app functionality
+from src.pipelines.prediction_pipeline import CustomData, CustomDataBatch, PredictPipeline  # Custom classes for data handling and prediction
+from src.schema import FEATURE_COLUMNS, format_errors  # Names of the nine input fields, error messages of a row
+from src.pipelines.prediction_cache import PredictionCache  # Optional LRU cache of predictions
+from src.pipelines.micro_batcher import MicroBatcher  # Optional coalescing of concurrent /predict requests
+from src.pipelines.model_registry import get_model_registry  # Shared preprocessor/model registry
+from src.metrics import REGISTRY, REQUESTS, REQUEST_ERRORS, STAGE_SECONDS  # Serving metrics
+from src.profiler import RequestProfiler  # Optional profiling of individual requests
+from src.resource_tracker import get_memory_usage  # Reports the memory of the serving process
 
 # Initialize the Flask application
 application = Flask(__name__)  # Create a Flask application instance
@@ -8,6 +19,89 @@ application = Flask(__name__)  # Create a Flask application instance
 # Alias for the Flask app instance
 app = application
 
+# Optional prediction cache shared by all requests, enabled by setting PREDICTION_CACHE_SIZE > 0
+# (PREDICTION_CACHE_TTL optionally expires entries after that many seconds)
+cache_size = int(os.environ.get('PREDICTION_CACHE_SIZE', '0'))
+cache_ttl = os.environ.get('PREDICTION_CACHE_TTL')
+prediction_cache = PredictionCache(cache_size, float(cache_ttl) if cache_ttl else None) if cache_size > 0 else None
+
+# Optional micro-batching of concurrent /predict requests, enabled by setting PREDICT_MICRO_BATCH=1
+# (MICRO_BATCH_MAX_SIZE and MICRO_BATCH_WAIT_MS tune the batch size and the batching window)
+micro_batcher = None
+if os.environ.get('PREDICT_MICRO_BATCH') == '1':
+    micro_batcher = MicroBatcher(
+        PredictPipeline(cache=prediction_cache),
+        max_batch_size=int(os.environ.get('MICRO_BATCH_MAX_SIZE', '0')) or None,
+        max_wait_ms=float(os.environ['MICRO_BATCH_WAIT_MS']) if 'MICRO_BATCH_WAIT_MS' in os.environ else None
+    )
+
+# Optional profiling of individual requests, written as pstats files to logs/profiles/:
+# PROFILE_TOKEN profiles the requests sending that token in the X-Profile header or the
+# ?profile= query flag, and PROFILE_SAMPLE_RATE profiles that fraction of all requests.
+# The hooks are only registered when one of them is set, so otherwise requests pay nothing.
+request_profiler = RequestProfiler(
+    token=os.environ.get('PROFILE_TOKEN'),
+    sample_rate=float(os.environ.get('PROFILE_SAMPLE_RATE', '0'))
+)
+if request_profiler.enabled:
+    @app.before_request
+    def start_request_profile():
+        if request_profiler.should_profile(request.headers, request.args):
+            g.profile = request_profiler.start()
+
+    @app.after_request
+    def stop_request_profile(response):
+        # Streamed response bodies (/predict_arrow) are produced after this point and not profiled
+        profile = g.pop('profile', None)
+        if profile is not None:
+            response.headers['X-Profile-File'] = os.path.basename(request_profiler.stop(profile, request.path))
+        return response
+
+    @app.teardown_request
+    def save_failed_request_profile(exc):
+        # Requests that raised skip after_request: still save what was captured
+        profile = g.pop('profile', None)
+        if profile is not None:
+            request_profiler.stop(profile, request.path)
+
+# Warm-up state reported by /ready
+warm_up_state = {'ready': False, 'seconds': None, 'pid': None}
+
+def warm_up():
+    """
+    Loads the preprocessor and model and runs a prediction through every serving path once.
+    The production server calls it in the parent process before forking the workers,
+    so every worker starts warm and shares these pages copy-on-write.
+    """
+    start = time.perf_counter()
+    sample = CustomData(carat=0.5, depth=61.5, table=57.0, x=5.1, y=5.1, z=3.1,
+                        cut='Ideal', color='G', clarity='VS1')
+    # Single-row path (also loads the artifacts into the shared registry)
+    PredictPipeline().predict(sample.get_data_as_dataframe())
+    # Batch path
+    PredictPipeline().predict_batch(CustomDataBatch.from_records([vars(sample)]))
+    # Template rendering
+    with application.test_request_context():
+        render_template('form.html', final_result=0.0)
+    warm_up_state.update(ready=True, seconds=time.perf_counter() - start, pid=os.getpid())
+
+# Gauges and counters read when /metrics is scraped
+REGISTRY.gauge('diamond_model_loaded', 'Whether the preprocessor/model pair is loaded.',
+               lambda: int(get_model_registry().stats()['loaded']))
+if prediction_cache is not None:
+    REGISTRY.counter_func('diamond_prediction_cache_hits_total', 'Prediction cache hits.',
+                          lambda: prediction_cache.hits)
+    REGISTRY.counter_func('diamond_prediction_cache_misses_total', 'Prediction cache misses.',
+                          lambda: prediction_cache.misses)
+    REGISTRY.counter_func('diamond_prediction_cache_evictions_total', 'Prediction cache evictions.',
+                          lambda: prediction_cache.evictions)
+if request_profiler.enabled:
+    REGISTRY.counter_func('diamond_profiles_written_total', 'Request profiles written to logs/profiles.',
+                          lambda: request_profiler.profiles_written)
+if micro_batcher is not None:
+    REGISTRY.gauge('diamond_micro_batch_queue_depth', 'Requests waiting to be micro-batched.',
+                   lambda: micro_batcher.stats()['queue_depth'])
+
 # Define a route for the home page
 @app.route('/')
 def home_page():
@@ -28,36 +122,177 @@ def predict_datapoint():
         # Render the input form for GET requests
         return render_template('form.html')
     else:
-        # Process the form data for POST requests
-        data = CustomData(
-            carat=float(request.form.get('carat')),  # Retrieve and convert 'carat' input to float
-            depth=float(request.form.get('depth')),  # Retrieve and convert 'depth' input to float
-            table=float(request.form.get('table')),  # Retrieve and convert 'table' input to float
-            x=float(request.form.get('x')),  # Retrieve and convert 'x' input to float
-            y=float(request.form.get('y')),  # Retrieve and convert 'y' input to float
-            z=float(request.form.get('z')),  # Retrieve and convert 'z' input to float
-            cut=request.form.get('cut'),  # Retrieve 'cut' input (string)
-            color=request.form.get('color'),  # Retrieve 'color' input (string)
-            clarity=request.form.get('clarity')  # Retrieve 'clarity' input (string)
-        )
-        
-        # Convert the custom data into a Pandas DataFrame
-        final_new_data = data.get_data_as_dataframe()
-        
-        # Initialize the prediction pipeline
-        predict_pipeline = PredictPipeline()
-        
-        # Predict using the input data
-        pred = predict_pipeline.predict(final_new_data)
-        
-        # Round off the prediction result to 2 decimal places
-        results = round(pred[0], 2)
-        
-        # Render the form template with the prediction result
-        return render_template('form.html', final_result=results)
+        REQUESTS.labels(route='/predict').inc()
+        try:
+            with STAGE_SECONDS.labels(stage='request').time():
+                # Validate the form data for POST requests in one vectorized pass
+                with STAGE_SECONDS.labels(stage='form_validation').time():
+                    fields = {col: request.form.get(col) for col in FEATURE_COLUMNS}
+                    features, errors = CustomDataBatch.from_records([fields]).get_data_as_dataframe()
+                if errors:
+                    # Show every invalid field at once instead of failing on the first one
+                    REQUEST_ERRORS.labels(route='/predict').inc()
+                    return render_template('form.html', errors=errors[0]), 400
+
+                if micro_batcher is not None and g.get('profile') is None:
+                    # Score together with the other requests waiting at the same time
+                    # (profiled requests are scored in their own thread, where the profiler runs)
+                    with STAGE_SECONDS.labels(stage='micro_batch').time():
+                        pred = [micro_batcher.predict(CustomData(**fields))]
+                else:
+                    # Initialize the prediction pipeline
+                    predict_pipeline = PredictPipeline(cache=prediction_cache)
+
+                    # Predict using the validated input data
+                    pred = predict_pipeline.predict(features)
+
+                # Round off the prediction result to 2 decimal places
+                results = round(pred[0], 2)
+
+                # Render the form template with the prediction result
+                with STAGE_SECONDS.labels(stage='render_template').time():
+                    return render_template('form.html', final_result=results)
+        except Exception:
+            REQUEST_ERRORS.labels(route='/predict').inc()
+            raise
+
+# Define a route for batch predictions
+@app.route('/predict_batch', methods=['POST'])
+def predict_batch():
+    """
+    Route to predict many diamonds in one JSON request.
+    Accepts either a list of records or {"columns": {feature: [values, ...]}}.
+    """
+    REQUESTS.labels(route='/predict_batch').inc()
+    payload = request.get_json(silent=True)
+    try:
+        # Build a columnar batch from the JSON payload
+        if isinstance(payload, dict) and 'columns' in payload:
+            batch = CustomDataBatch(payload['columns'])
+        elif isinstance(payload, dict) and 'records' in payload:
+            batch = CustomDataBatch.from_records(payload['records'])
+        elif isinstance(payload, list):
+            batch = CustomDataBatch.from_records(payload)
+        else:
+            REQUEST_ERRORS.labels(route='/predict_batch').inc()
+            return jsonify({'error': 'Expected a JSON list of records, {"records": [...]} or {"columns": {...}}'}), 400
+    except Exception as e:
+        REQUEST_ERRORS.labels(route='/predict_batch').inc()
+        return jsonify({'error': str(e)}), 400
+
+    try:
+        # Predict the whole batch with one transform/predict call
+        preds, errors = PredictPipeline(cache=prediction_cache).predict_batch(batch)
+    except Exception:
+        REQUEST_ERRORS.labels(route='/predict_batch').inc()
+        raise
+
+    # Keep the input order; invalid rows get a null prediction and an error entry
+    return jsonify({
+        'predictions': [None if row in errors else round(float(pred), 2) for row, pred in enumerate(preds)],
+        'errors': [{'row': row, 'error': format_errors(row_errors), 'details': row_errors}
+                   for row, row_errors in errors.items()]
+    })
+
+# Media type of the Arrow IPC streaming format, used by /predict_arrow for requests and responses
+ARROW_STREAM_MIMETYPE = 'application/vnd.apache.arrow.stream'
+
+# Define a route for columnar Arrow IPC batches
+@app.route('/predict_arrow', methods=['POST'])
+def predict_arrow():
+    """
+    Route to predict bulk batches sent as an Arrow IPC stream holding the nine features.
+    Every record batch is scored as one columnar batch, and the response is an Arrow IPC stream
+    with one batch per input batch: 'prediction' (float64, null for invalid rows) and 'error'
+    (string, null for valid rows), in input order.
+    """
+    REQUESTS.labels(route='/predict_arrow').inc()
+    try:
+        import pyarrow as pa  # Optional dependency, only needed by Arrow clients
+    except ImportError:
+        REQUEST_ERRORS.labels(route='/predict_arrow').inc()
+        return jsonify({'error': "The Arrow endpoint requires the 'pyarrow' package"}), 501
+
+    try:
+        # Read the schema up front, so a malformed stream is rejected before streaming the response
+        reader = pa.ipc.open_stream(request.stream)
+        missing_columns = [col for col in FEATURE_COLUMNS if col not in reader.schema.names]
+        if missing_columns:
+            raise ValueError(f"Missing feature columns: {missing_columns}")
+    except Exception as e:
+        REQUEST_ERRORS.labels(route='/predict_arrow').inc()
+        return jsonify({'error': str(e)}), 400
+
+    # No prediction cache here: building its per-row keys would undo the columnar path
+    pipeline = PredictPipeline()
+    result_schema = pa.schema([('prediction', pa.float64()), ('error', pa.string())])
+
+    def generate():
+        sink = io.BytesIO()
+        try:
+            with pa.ipc.new_stream(sink, result_schema) as writer:
+                for record_batch in reader:
+                    preds, errors = pipeline.predict_batch(CustomDataBatch.from_arrow(record_batch))
+                    # Only the invalid rows are visited one by one
+                    invalid = np.zeros(len(preds), dtype=bool)
+                    messages = np.full(len(preds), None, dtype=object)
+                    for row, row_errors in errors.items():
+                        invalid[row] = True
+                        messages[row] = format_errors(row_errors)
+                    writer.write_batch(pa.record_batch(
+                        [pa.array(preds, mask=invalid), pa.array(messages, type=pa.string())],
+                        schema=result_schema
+                    ))
+                    # Send each result batch as soon as it is scored
+                    yield sink.getvalue()
+                    sink.seek(0)
+                    sink.truncate()
+            yield sink.getvalue()  # End-of-stream marker
+        except Exception:
+            REQUEST_ERRORS.labels(route='/predict_arrow').inc()
+            raise
+
+    return Response(stream_with_context(generate()), mimetype=ARROW_STREAM_MIMETYPE)
+
+# Define a route exposing the micro-batching statistics
+@app.route('/predict/batching', methods=['GET'])
+def batching_stats():
+    """
+    Route returning the micro-batching configuration, queue depth and batch-size histogram.
+    """
+    if micro_batcher is None:
+        return jsonify({'enabled': False})
+    return jsonify({'enabled': True, **micro_batcher.stats()})
+
+# Define a readiness route for the load balancer / process manager
+@app.route('/ready', methods=['GET'])
+def ready():
+    """
+    Route reporting healthy (200) only once the model is loaded and warmed up, 503 before that.
+    Also reports the warm-up time and the memory of this worker.
+    """
+    body = {
+        'ready': warm_up_state['ready'],
+        'warm_up_seconds': warm_up_state['seconds'],
+        'warmed_up_in_parent': warm_up_state['pid'] not in (None, os.getpid()),
+        'pid': os.getpid(),
+        'model': get_model_registry().stats(),
+        'memory': get_memory_usage()
+    }
+    return jsonify(body), 200 if warm_up_state['ready'] else 503
+
+# Define a route exposing the serving metrics
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """
+    Route returning request counters and stage latency histograms in the Prometheus text format.
+    """
+    return Response(REGISTRY.render(), mimetype='text/plain; version=0.0.4')
 
 # Run the application
 if __name__ == "__main__":
     # Run the Flask application on host '0.0.0.0' (accessible from all devices in the network)
     # Enable debug mode for live error tracking during development
+    # (production uses the preforking server instead: gunicorn -c gunicorn.conf.py application:application)
+    warm_up()
     app.run(host='0.0.0.0', debug=True)
\ No newline at end of file
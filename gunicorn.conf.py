@@ -0,0 +1,39 @@
+# Gunicorn configuration of the production server:
+#     gunicorn -c gunicorn.conf.py application:application
+#
+# The application is imported, and the model loaded and warmed up, once in the master process.
+# Workers are then forked from it and share those pages copy-on-write, so a new (or recycled)
+# worker serves its first request without importing pandas/scikit-learn or unpickling anything.
+
+import gc  # Used to keep the warmed-up objects out of the garbage collector before forking
+import os  # Reads the server configuration from the environment
+from src.logger import logging  # Custom logging module for logging information
+
+# Address and number of worker processes (WEB_CONCURRENCY is also what Elastic Beanstalk sets)
+bind = os.environ.get('BIND', '0.0.0.0:8000')
+workers = int(os.environ.get('WEB_CONCURRENCY', os.cpu_count() or 1))
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+
+# Import the application in the master so workers fork from a loaded, warmed-up process
+preload_app = True
+
+# Graceful recycling: a worker is replaced after serving max_requests (+ jitter) requests,
+# and gets graceful_timeout seconds to finish its in-flight requests
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 10000))
+max_requests_jitter = int(os.environ.get('GUNICORN_MAX_REQUESTS_JITTER', 1000))
+graceful_timeout = 30
+timeout = 60
+
+
+def on_starting(server):
+    # Runs in the master after the application is imported and before any worker is forked
+    from application import warm_up, warm_up_state
+    warm_up()
+    # Move everything allocated so far to a permanent generation so the collector does not
+    # touch (and thereby copy) these pages in the workers
+    gc.freeze()
+    logging.info("Model warmed up in the master in %.3fs", warm_up_state['seconds'])
+
+
+def post_fork(server, worker):
+    logging.info("Worker %s forked from the warmed-up master", worker.pid)
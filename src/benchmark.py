@@ -0,0 +1,283 @@
+# Import necessary modules
+import os  # Used for building paths and switching to a scratch directory
+import sys  # Provides access to system-specific parameters and functions
+import json  # Reads and writes the machine-readable results
+import time  # High resolution timers
+import shutil  # Removes the scratch directory of the training benchmarks
+import argparse  # Parses the command line options of the benchmark runner
+import platform  # Records the machine the benchmarks ran on
+import tempfile  # Scratch directory for the training benchmarks
+import contextlib  # Discards the output the training stages print while they are timed
+from datetime import datetime  # Timestamp of the run
+import numpy as np  # Used for percentiles and sampling
+import pandas as pd  # Recorded in the run metadata
+import sklearn  # Recorded in the run metadata
+
+from src.logger import logging  # Custom logging module for logging information
+from src.pipelines.model_registry import ModelRegistry  # Used to measure cold artifact loads
+from src.pipelines.prediction_pipeline import CustomData, PredictPipeline
+from src.schema import FEATURE_COLUMNS, read_dataset  # Reads the benchmark data with the dataset's dtypes
+
+
+def summarize(samples):
+    """
+    Returns percentiles (in milliseconds) of a list of durations given in seconds.
+    """
+    ms = np.asarray(samples) * 1000.0
+    return {
+        'n': int(ms.size),
+        'mean_ms': float(ms.mean()),
+        'min_ms': float(ms.min()),
+        'p50_ms': float(np.percentile(ms, 50)),
+        'p90_ms': float(np.percentile(ms, 90)),
+        'p99_ms': float(np.percentile(ms, 99)),
+        'max_ms': float(ms.max()),
+    }
+
+
+def time_calls(func, repeat, warmup=1):
+    """
+    Calls `func` `warmup` times, then times `repeat` calls and returns their durations.
+    """
+    for _ in range(warmup):
+        func()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+class BenchmarkSuite:
+    """
+    Measures inference and training stages offline against artifacts/test.csv and the saved artifacts.
+    """
+    def __init__(self, data_path=os.path.join('artifacts', 'test.csv'), repeat=50, seed=42, training_repeat=5):
+        self.data_path = data_path
+        self.repeat = repeat
+        self.seed = seed
+        self.training_repeat = training_repeat
+        self.features = read_dataset(data_path)[FEATURE_COLUMNS]
+
+    def _sample(self, size):
+        # Rows drawn with a fixed seed, with replacement when more rows than the file are needed
+        rng = np.random.default_rng(self.seed)
+        index = rng.choice(len(self.features), size=size, replace=size > len(self.features))
+        return self.features.iloc[index].reset_index(drop=True)
+
+    def bench_dataframe(self):
+        row = self.features.iloc[0].to_dict()
+        data = CustomData(**row)
+        return summarize(time_calls(data.get_data_as_dataframe, self.repeat))
+
+    def bench_cold_predict(self):
+        # Each sample uses a fresh registry, so it pays the artifact load
+        row = self._sample(1)
+        return summarize(time_calls(
+            lambda: PredictPipeline(registry=ModelRegistry()).predict(row), max(self.repeat // 10, 3), warmup=0
+        ))
+
+    def bench_warm_predict(self):
+        row = self._sample(1)
+        pipeline = PredictPipeline()
+        return summarize(time_calls(lambda: pipeline.predict(row), self.repeat))
+
+    def bench_batch(self, size):
+        batch = self._sample(size)
+        pipeline = PredictPipeline()
+        repeat = max(3, min(self.repeat, 100000 // size))
+        result = summarize(time_calls(lambda: pipeline.predict(batch), repeat))
+        result['rows_per_second'] = size / (result['p50_ms'] / 1000.0)
+        return result
+
+    def bench_flask_predict(self):
+        from application import app
+        form = {col: str(value) for col, value in self.features.iloc[0].items()}
+        client = app.test_client()
+        return summarize(time_calls(lambda: client.post('/predict', data=form), self.repeat))
+
+    def bench_flask_transports(self, size=10000):
+        """
+        Measures the rows per second of the serving routes for the same rows: one form per
+        row on /predict, JSON columns on /predict_batch and an Arrow IPC stream on /predict_arrow.
+        """
+        from application import app
+        batch = self._sample(size)
+        client = app.test_client()
+        results = {}
+
+        forms = [{col: str(value) for col, value in row.items()} for row in batch.head(200).to_dict('records')]
+        samples = time_calls(lambda: [client.post('/predict', data=form) for form in forms], 3)
+        results['form'] = summarize(samples)
+        results['form']['rows_per_second'] = len(forms) / float(np.median(samples))
+
+        columns = {col: batch[col].tolist() for col in FEATURE_COLUMNS}
+        samples = time_calls(lambda: client.post('/predict_batch', json={'columns': columns}), 5)
+        results['json'] = summarize(samples)
+        results['json']['rows_per_second'] = size / float(np.median(samples))
+
+        try:
+            import pyarrow as pa
+        except ImportError:
+            logging.info('pyarrow is not installed, skipping the Arrow benchmark')
+            return results
+        sink = pa.BufferOutputStream()
+        table = pa.Table.from_pandas(batch, preserve_index=False)
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        body = sink.getvalue().to_pybytes()
+        samples = time_calls(lambda: client.post('/predict_arrow', data=body,
+                                                 content_type='application/vnd.apache.arrow.stream').get_data(), 5)
+        results['arrow'] = summarize(samples)
+        results['arrow']['rows_per_second'] = size / float(np.median(samples))
+        return results
+
+    def bench_training(self):
+        """
+        Times each training stage over `training_repeat` runs, after one untimed warm-up run, using
+        the benchmark data as source. Every run starts from an empty scratch directory, and the
+        output the stages print is discarded.
+        """
+        from src.components.data_ingestion import DataIngestion
+        from src.components.data_transformation import DataTransformation
+        from src.components.model_trainer import ModelTrainer
+
+        source_path = os.path.abspath(self.data_path)
+        cwd = os.getcwd()
+        samples = {'data_ingestion': [], 'data_transformation': [], 'model_training': []}
+        for run in range(self.training_repeat + 1):
+            scratch = tempfile.mkdtemp(prefix='benchmark_')
+            try:
+                os.chdir(scratch)
+                durations = {}
+                with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                    ingestion = DataIngestion()
+                    ingestion.ingestion_config.source_data_path = source_path
+                    start = time.perf_counter()
+                    train_path, test_path = ingestion.initiate_data_ingestion()
+                    durations['data_ingestion'] = time.perf_counter() - start
+
+                    start = time.perf_counter()
+                    train_arr_paths, test_arr_paths, _ = DataTransformation().initiate_data_transformation(
+                        train_path, test_path)
+                    durations['data_transformation'] = time.perf_counter() - start
+
+                    start = time.perf_counter()
+                    ModelTrainer().initate_model_training(train_arr_paths, test_arr_paths)
+                    durations['model_training'] = time.perf_counter() - start
+            finally:
+                os.chdir(cwd)
+                shutil.rmtree(scratch, ignore_errors=True)
+            if run:  # The first run is the warm-up
+                for stage, duration in durations.items():
+                    samples[stage].append(duration)
+
+        return {stage: summarize(stage_samples) for stage, stage_samples in samples.items()}
+
+    def run(self, include_training=True):
+        """
+        Runs every benchmark and returns the results with the run metadata.
+        """
+        results = {
+            'custom_data.get_data_as_dataframe': self.bench_dataframe(),
+            'predict_pipeline.predict.cold': self.bench_cold_predict(),
+            'predict_pipeline.predict.warm': self.bench_warm_predict(),
+        }
+        for size in (1, 100, 10000, 100000):
+            results[f'predict_pipeline.predict.batch_{size}'] = self.bench_batch(size)
+        results['flask./predict'] = self.bench_flask_predict()
+        for transport, result in self.bench_flask_transports().items():
+            results[f'flask.transport.{transport}'] = result
+        if include_training:
+            for stage, result in self.bench_training().items():
+                results[f'training.{stage}'] = result
+
+        return {
+            'metadata': {
+                'timestamp': datetime.now().isoformat(timespec='seconds'),
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'cpu_count': os.cpu_count(),
+                'numpy': np.__version__,
+                'pandas': pd.__version__,
+                'sklearn': sklearn.__version__,
+                'data_path': self.data_path,
+                'repeat': self.repeat,
+                'training_repeat': self.training_repeat,
+                'seed': self.seed,
+            },
+            'results': results,
+        }
+
+
+def compare(baseline, current, threshold, metric='p50_ms', min_samples=3):
+    """
+    Compares two benchmark runs and returns the benchmarks that slowed down past `threshold`.
+
+    Benchmarks timed fewer than `min_samples` times in either run (e.g. results written before
+    the training stages were repeated) are listed but never reported as regressions.
+
+    Args:
+        baseline (dict): Results of the reference run.
+        current (dict): Results of the new run.
+        threshold (float): Allowed relative slowdown (0.1 allows 10%).
+        metric (str): Statistic compared between the runs.
+        min_samples (int): Minimum number of timed calls for a benchmark to be compared.
+
+    Returns:
+        list: (benchmark, baseline value, current value, relative change) of each regression.
+    """
+    regressions = []
+    for name, result in current['results'].items():
+        reference = baseline['results'].get(name)
+        if reference is None or not reference.get(metric):
+            continue
+        change = result[metric] / reference[metric] - 1.0
+        too_few = min(result['n'], reference['n']) < min_samples
+        print(f"{name:<45} {reference[metric]:>12.3f} {result[metric]:>12.3f} {change:>+8.1%}"
+              + ('   (too few samples, not compared)' if too_few else ''))
+        if change > threshold and not too_few:
+            regressions.append((name, reference[metric], result[metric], change))
+    return regressions
+
+
+# Entry point of the script.
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark the inference and training stages.')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = subparsers.add_parser('run', help='Run the benchmarks and write the results as JSON')
+    run_parser.add_argument('--output', default='benchmark.json', help='Path of the JSON results')
+    run_parser.add_argument('--data', default=os.path.join('artifacts', 'test.csv'), help='Benchmark data')
+    run_parser.add_argument('--repeat', type=int, default=50, help='Timed calls per benchmark')
+    run_parser.add_argument('--training-repeat', type=int, default=5, help='Timed runs of each training stage')
+    run_parser.add_argument('--skip-training', action='store_true', help='Only run the inference benchmarks')
+
+    compare_parser = subparsers.add_parser('compare', help='Compare two runs and flag slowdowns')
+    compare_parser.add_argument('baseline', help='JSON results of the reference run')
+    compare_parser.add_argument('current', help='JSON results of the new run')
+    compare_parser.add_argument('--threshold', type=float, default=0.10, help='Allowed relative slowdown')
+    compare_parser.add_argument('--metric', default='p50_ms', help='Statistic to compare')
+    compare_parser.add_argument('--min-samples', type=int, default=3,
+                                help='Minimum number of timed calls for a benchmark to be compared')
+
+    args = parser.parse_args()
+
+    if args.command == 'run':
+        report = BenchmarkSuite(args.data, args.repeat, training_repeat=args.training_repeat).run(
+            include_training=not args.skip_training)
+        with open(args.output, 'w') as file_obj:
+            json.dump(report, file_obj, indent=2)
+        for name, result in report['results'].items():
+            print(f"{name:<45} p50 {result['p50_ms']:>10.3f} ms   p99 {result['p99_ms']:>10.3f} ms")
+        logging.info('Benchmark results written to %s', args.output)
+    else:
+        with open(args.baseline) as file_obj:
+            baseline = json.load(file_obj)
+        with open(args.current) as file_obj:
+            current = json.load(file_obj)
+        regressions = compare(baseline, current, args.threshold, args.metric, args.min_samples)
+        for name, old, new, change in regressions:
+            print(f"REGRESSION {name}: {old:.3f} -> {new:.3f} ({change:+.1%})")
+        sys.exit(1 if regressions else 0)
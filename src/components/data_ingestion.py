@@ -2,8 +2,10 @@ import os  # Module for interacting with the operating system (e.g., file paths,
 import sys  # Provides system-specific parameters and functions.
 from src.logger import logging  # Custom logging module for logging events.
 from src.exception import CustomException  # Custom exception class for handling errors.
-import pandas as pd  # Library for data manipulation and analysis.
+import numpy as np  # Used to hash the row ids.
 from sklearn.model_selection import train_test_split  # Function to split data into training and testing sets.
+from src.schema import ID_COLUMN, read_dataset, iter_dataset  # Reads the dataset with its declared compact dtypes.
+from src.resource_tracker import record_shape  # Reports the size of the data to the run report.
 from dataclasses import dataclass  # Simplifies the creation of data classes for managing data.
 
 # Define a configuration class for data ingestion.
@@ -13,6 +15,43 @@ class DataIngestionconfig:
     train_data_path = os.path.join('artifacts', 'train.csv')  # Path for training data.
     test_data_path = os.path.join('artifacts', 'test.csv')  # Path for testing data.
     raw_data_path = os.path.join('artifacts', 'raw.csv')  # Path for raw data.
+    # Source dataset and train-test split parameters.
+    source_data_path = os.path.join('notebooks/data', 'gemstone.csv')  # Path of the source dataset.
+    test_size = 0.30  # Fraction of the rows used for testing.
+    random_state = 42  # Seed of the train-test split.
+    save_raw_data = True  # Whether to write the copy of the source to raw.csv.
+    # Streaming mode: the source is read in chunks and every row is assigned to a split by a
+    # hash of its id, so memory use is constant and a row stays in its split when rows are added.
+    streaming = False
+    chunk_size = 100000  # Number of rows read at a time in streaming mode.
+
+
+def hash_split_mask(ids, test_size, seed):
+    """
+    Returns a boolean mask of the rows assigned to the test split, from a hash of their id.
+
+    Each id is mixed with the seed by the SplitMix64 finalizer and mapped to a uniform number
+    in [0, 1); the row is a test row when that number is below `test_size`. The assignment of a
+    row depends only on its id, the seed and the ratio.
+
+    Args:
+        ids (array-like): Integer row ids.
+        test_size (float): Fraction of the rows assigned to the test split.
+        seed (int): Seed mixed into the hash.
+
+    Returns:
+        np.ndarray: True for the test rows.
+    """
+    x = np.asarray(ids).astype(np.uint64)
+    x = x + np.full_like(x, seed) * np.uint64(0x9E3779B97F4A7C15)  # Wraps around like the C version
+    x ^= x >> np.uint64(30)
+    x *= np.uint64(0xBF58476D1CE4E5B9)
+    x ^= x >> np.uint64(27)
+    x *= np.uint64(0x94D049BB133111EB)
+    x ^= x >> np.uint64(31)
+    # The top 53 bits as a float in [0, 1)
+    return (x >> np.uint64(11)).astype(np.float64) * (1.0 / 2**53) < test_size
+
 
 # Define a data ingestion class to manage the data ingestion process.
 class DataIngestion:
@@ -25,23 +64,33 @@ class DataIngestion:
         Reads raw data, splits it into training and testing sets, 
         and saves the data to specified file paths.
         """
+        if self.ingestion_config.streaming:
+            return self.initiate_streaming_data_ingestion()
+
         logging.info('Data Ingestion method starts')  # Log the start of data ingestion.
 
         try:
-            # Read the raw dataset from a specified path.
-            df = pd.read_csv(os.path.join('notebooks/data', 'gemstone.csv'))
+            # Read the raw dataset from a specified path, with float32 numerics and categorical grades
+            # (unknown grades are rejected here rather than during the transformation).
+            df = read_dataset(self.ingestion_config.source_data_path)
             logging.info('Dataset read as pandas DataFrame')  # Log successful data reading.
+            record_shape(*df.shape)
 
             # Create the directory for saving raw data if it doesn't already exist.
             os.makedirs(os.path.dirname(self.ingestion_config.raw_data_path), exist_ok=True)
 
             # Save the raw data to a CSV file.
-            df.to_csv(self.ingestion_config.raw_data_path, index=False)
+            if self.ingestion_config.save_raw_data:
+                df.to_csv(self.ingestion_config.raw_data_path, index=False)
 
             logging.info("Train test split")  # Log the train-test split process.
             
             # Split the dataset into training and testing sets.
-            train_set, test_set = train_test_split(df, test_size=0.30, random_state=42)
+            train_set, test_set = train_test_split(
+                df,
+                test_size=self.ingestion_config.test_size,
+                random_state=self.ingestion_config.random_state
+            )
 
             # Save the training and testing data to their respective CSV files.
             train_set.to_csv(self.ingestion_config.train_data_path, index=False, header=True)
@@ -59,3 +108,57 @@ class DataIngestion:
             # Handle any exceptions that occur during data ingestion.
             logging.info('Error occurred in Data Ingestion config')
             raise CustomException(e, sys)  # Raise a custom exception with the error details.
+
+    def initiate_streaming_data_ingestion(self):
+        """
+        Streams the source dataset in chunks and appends each row to the train or test file
+        according to a hash of its id (see hash_split_mask).
+
+        Only one chunk is in memory at a time. The files are written under temporary names
+        and renamed once complete, so a failed run never leaves a partial split behind.
+        """
+        logging.info('Streaming Data Ingestion method starts')
+
+        tmp_paths = {}  # Partial files written so far, removed if the ingestion fails
+        try:
+            config = self.ingestion_config
+            os.makedirs(os.path.dirname(config.train_data_path), exist_ok=True)
+            paths = {'train': config.train_data_path, 'test': config.test_data_path}
+            if config.save_raw_data:
+                paths['raw'] = config.raw_data_path
+            tmp_paths = {part: f'{path}.{os.getpid()}.tmp' for part, path in paths.items()}
+
+            counts = {'train': 0, 'test': 0}
+            for i, chunk in enumerate(iter_dataset(config.source_data_path, config.chunk_size)):
+                if ID_COLUMN not in chunk.columns:
+                    raise ValueError(f"The hash split needs the '{ID_COLUMN}' column in {config.source_data_path}")
+                record_shape(*chunk.shape)
+                is_test = hash_split_mask(chunk[ID_COLUMN].to_numpy(), config.test_size, config.random_state)
+                parts = {'train': chunk[~is_test], 'test': chunk[is_test]}
+                if config.save_raw_data:
+                    parts['raw'] = chunk
+                # The first chunk creates the files with their header, the next ones are appended
+                for part, rows in parts.items():
+                    rows.to_csv(tmp_paths[part], mode='w' if i == 0 else 'a', header=i == 0, index=False)
+                counts['train'] += len(parts['train'])
+                counts['test'] += len(parts['test'])
+            if not counts['train'] + counts['test']:
+                raise ValueError(f'No rows found in {config.source_data_path}')
+
+            for part, path in paths.items():
+                os.replace(tmp_paths[part], path)
+            logging.info('Streaming ingestion completed: %d train rows, %d test rows',
+                         counts['train'], counts['test'])
+
+            return (
+                config.train_data_path,
+                config.test_data_path
+            )
+
+        except Exception as e:
+            # Remove the partial files, the previous split (if any) is left untouched
+            for tmp_path in tmp_paths.values():
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+            logging.info('Error occurred in Streaming Data Ingestion')
+            raise CustomException(e, sys)
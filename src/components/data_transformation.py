@@ -1,22 +1,183 @@
 from sklearn.impute import SimpleImputer  # Handles missing values by imputing them with median or most frequent values.
 from sklearn.preprocessing import StandardScaler  # Performs feature scaling (standardization of numerical features).
-from sklearn.preprocessing import OrdinalEncoder  # Encodes categorical data with a specified ordinal order.
+from sklearn.base import BaseEstimator, TransformerMixin  # Base classes of the categorical code encoder.
+from sklearn.utils.validation import check_is_fitted  # Checks the encoder is fitted before transforming.
 from sklearn.pipeline import Pipeline  # Helps streamline a series of data processing steps.
 from sklearn.compose import ColumnTransformer  # Applies different transformations to different columns of the dataset.
 import sys, os  # For system-level operations and path handling.
 from dataclasses import dataclass  # Used to define classes with less boilerplate code for storing configuration.
 import pandas as pd  # For data manipulation and analysis.
 import numpy as np  # For numerical operations.
+from joblib import Parallel, delayed  # Runs the row blocks of the transformation concurrently.
 
 from src.exception import CustomException  # A custom exception handler defined elsewhere in the project.
 from src.logger import logging  # Custom logging utility for better tracking of the code's progress.
-from src.utils import save_object  # Utility function to save objects (e.g., preprocessors) for future use.
+from src.serialization import save_object, save_array  # Utility functions to save objects and arrays for future use.
+from src.resource_tracker import record_shape  # Reports the size of the data to the run report.
+from src.schema import (  # Declared columns, category rankings and dtypes of the dataset.
+    NUMERICAL_COLUMNS, CATEGORICAL_COLUMNS, CUT_CATEGORIES, COLOR_CATEGORIES, CLARITY_CATEGORIES,
+    TARGET_COLUMN, read_dataset
+)
+
+
+class CategoricalCodeEncoder(TransformerMixin, BaseEstimator):
+    """
+    Encodes categorical columns as the position of each value in a fixed list of categories.
+
+    Columns that already hold pandas categoricals with these categories (as produced by the
+    dataset schema) are encoded by reading their integer codes; other columns are converted
+    with one vectorized pd.Categorical call. Missing values are encoded as NaN so that they can
+    be imputed afterwards, and values outside the categories raise a ValueError.
+    """
+    def __init__(self, categories):
+        self.categories = categories
+
+    def fit(self, X, y=None):
+        self.categories_ = [np.asarray(cats, dtype=object) for cats in self.categories]
+        self.n_features_in_ = len(self.categories_)
+        if hasattr(X, 'columns'):
+            self.feature_names_in_ = np.asarray(X.columns, dtype=object)
+        return self
+
+    def transform(self, X):
+        check_is_fitted(self)
+        X = X if hasattr(X, 'iloc') else pd.DataFrame(np.asarray(X, dtype=object))
+        encoded = np.empty((len(X), len(self.categories_)), dtype=np.float64)
+        for j, cats in enumerate(self.categories_):
+            values = X.iloc[:, j]
+            if isinstance(values.dtype, pd.CategoricalDtype) and list(values.dtype.categories) == list(cats):
+                codes = values.cat.codes.to_numpy()
+            else:
+                codes = pd.Categorical(values, categories=cats).codes
+                unknown = (codes == -1) & values.notna().to_numpy()
+                if unknown.any():
+                    raise ValueError(
+                        f"Found unknown categories {sorted(map(str, set(values[unknown])))} "
+                        f"in column {j} during transform"
+                    )
+            encoded[:, j] = codes
+            encoded[codes == -1, j] = np.nan  # Missing value
+        return encoded
+
+    def get_feature_names_out(self, input_features=None):
+        if input_features is None:
+            input_features = getattr(self, 'feature_names_in_', [f'x{j}' for j in range(len(self.categories))])
+        return np.asarray(input_features, dtype=object)
+
+
+def _transform_block(transformer, X, columns, out, rows, out_columns):
+    """
+    Transforms one block of rows with one fitted branch of a ColumnTransformer, writing the
+    result into its rows and columns of `out`.
+    """
+    # Slicing the rows first makes the column selection copy only this block
+    out[rows, out_columns] = transformer.transform(X.iloc[rows][columns])
+
+
+def transform_in_chunks(preprocessor, X, out=None, chunk_size=50000, n_jobs=None):
+    """
+    Applies a fitted ColumnTransformer to blocks of rows in parallel, writing into one preallocated array.
+
+    Every (row block, branch) pair is a separate task, so the numerical and categorical branches
+    of a block run concurrently, and only block-sized intermediate copies exist at any time.
+    The tasks run in threads (NumPy releases the GIL) and write straight into `out`, which can
+    be a memory-mapped .npy file. The result equals preprocessor.transform(X).
+
+    Args:
+        preprocessor (ColumnTransformer): The fitted preprocessor.
+        X (pd.DataFrame): Frame holding (at least) the columns the preprocessor was fitted on.
+        out (np.ndarray, optional): Output array of shape (len(X), number of output features).
+        chunk_size (int): Number of rows per block.
+        n_jobs (int, optional): Number of concurrent tasks (-1 uses all cores).
+
+    Returns:
+        np.ndarray: The transformed features (`out` if given).
+    """
+    n_rows = len(X)
+    n_features = sum(columns.stop - columns.start for columns in preprocessor.output_indices_.values())
+    if out is None:
+        out = np.empty((n_rows, n_features), dtype=np.float64)
+
+    branches = []
+    for name, transformer, columns in preprocessor.transformers_:
+        out_columns = preprocessor.output_indices_[name]
+        if transformer == 'drop' or out_columns.start == out_columns.stop:
+            continue
+        if transformer == 'passthrough':
+            raise ValueError(f"transform_in_chunks does not support passthrough branch '{name}'")
+        branches.append((transformer, columns, out_columns))
+
+    Parallel(n_jobs=n_jobs, backend='threading')(
+        delayed(_transform_block)(transformer, X, columns, out, slice(start, start + chunk_size), out_columns)
+        for start in range(0, n_rows, chunk_size)
+        for transformer, columns, out_columns in branches
+    )
+    return out
+
+
+def fit_in_chunks(preprocessor, X, chunk_size=50000):
+    """
+    Fits the preprocessor of DataTransformation one block of rows at a time.
+
+    Every step is first fitted on the first block. The statistics that need every row are then
+    replaced by ones computed over all the rows, as IncrementalTrainer does: the medians of the
+    numerical columns one column at a time, the most frequent rank of every categorical column
+    from per-block counts, and the means and variances of the scalers with
+    StandardScaler.partial_fit on the imputed blocks. The medians and most frequent ranks are
+    exact; the scaling statistics equal those of preprocessor.fit(X) up to rounding.
+
+    Args:
+        preprocessor (ColumnTransformer): The unfitted preprocessor.
+        X (pd.DataFrame): Training frame holding (at least) the feature columns.
+        chunk_size (int): Number of rows per block.
+
+    Returns:
+        ColumnTransformer: The fitted preprocessor.
+    """
+    preprocessor.fit(X.iloc[:chunk_size])
+    num_pipeline = preprocessor.named_transformers_['num_pipeline']
+    cat_pipeline = preprocessor.named_transformers_['cat_pipeline']
+    blocks = [slice(start, start + chunk_size) for start in range(0, len(X), chunk_size)]
+
+    # Medians of the numerical columns, one column at a time
+    num_imputer = num_pipeline.named_steps['imputer']
+    num_imputer.statistics_ = np.array(
+        [np.nanmedian(X[col].to_numpy()) for col in NUMERICAL_COLUMNS], dtype=num_imputer.statistics_.dtype)
+
+    # Most frequent rank of every categorical column (the lowest one on ties, as SimpleImputer does)
+    encoder = cat_pipeline.named_steps['ordinalencoder']
+    counts = [np.zeros(len(cats), dtype=np.int64) for cats in encoder.categories_]
+    for rows in blocks:
+        codes = encoder.transform(X.iloc[rows][CATEGORICAL_COLUMNS])
+        for j, column_codes in enumerate(codes.T):
+            column_codes = column_codes[~np.isnan(column_codes)].astype(np.intp)
+            counts[j] += np.bincount(column_codes, minlength=len(counts[j]))
+    cat_pipeline.named_steps['imputer'].statistics_ = np.array(
+        [np.argmax(column_counts) for column_counts in counts], dtype=np.float64)
+
+    # Means and variances of the imputed columns over all the rows
+    num_scaler, cat_scaler = StandardScaler(), StandardScaler()
+    for rows in blocks:
+        block = X.iloc[rows]
+        num_scaler.partial_fit(num_pipeline[:-1].transform(block[NUMERICAL_COLUMNS]))
+        cat_scaler.partial_fit(cat_pipeline[:-1].transform(block[CATEGORICAL_COLUMNS]))
+    num_pipeline.set_params(scaler=num_scaler)
+    cat_pipeline.set_params(scaler=cat_scaler)
+    return preprocessor
 
 
 @dataclass
 class DataTransformationconfig:
     preprocessor_obj_file_path = os.path.join('artifacts', 'preprocessor.pkl')  
     # Path to save the serialized preprocessor object.
+    train_features_file_path = os.path.join('artifacts', 'train_features.npy')
+    train_target_file_path = os.path.join('artifacts', 'train_target.npy')
+    test_features_file_path = os.path.join('artifacts', 'test_features.npy')
+    test_target_file_path = os.path.join('artifacts', 'test_target.npy')
+    # Paths to save the transformed features and the target, stored separately so that
+    # ModelTrainer can memory-map them without concatenating features and target.
+    transform_chunk_size = 50000  # Rows transformed per task.
+    n_jobs = -1  # Number of concurrent transformation tasks (-1 uses all cores).
 
 
 class DataTransformation:
@@ -32,13 +193,13 @@ class DataTransformation:
             logging.info('Data Transformation initiated')
 
             # Define columns for transformations.
-            categorical_cols = ['cut', 'color', 'clarity']  # Columns with categorical data.
-            numerical_cols = ['carat', 'depth', 'table', 'x', 'y', 'z']  # Columns with numerical data.
+            categorical_cols = CATEGORICAL_COLUMNS  # Columns with categorical data.
+            numerical_cols = NUMERICAL_COLUMNS  # Columns with numerical data.
 
             # Define ranking for ordinal encoding of categorical variables.
-            cut_categories = ['Fair', 'Good', 'Very Good', 'Premium', 'Ideal']
-            color_categories = ['D', 'E', 'F', 'G', 'H', 'I', 'J']
-            clarity_categories = ['I1', 'SI2', 'SI1', 'VS2', 'VS1', 'VVS2', 'VVS1', 'IF']
+            cut_categories = CUT_CATEGORIES
+            color_categories = COLOR_CATEGORIES
+            clarity_categories = CLARITY_CATEGORIES
 
             logging.info('Pipeline Initiated')
 
@@ -48,10 +209,11 @@ class DataTransformation:
                 ('scaler', StandardScaler())  # Standardize features.
             ])
 
-            # Define categorical pipeline: handles missing values, encodes, and scales categorical data.
+            # Define categorical pipeline: encodes, handles missing values, and scales categorical data.
             cat_pipeline = Pipeline(steps=[
-                ('imputer', SimpleImputer(strategy='most_frequent')),  # Fill missing values with the most frequent value.
-                ('ordinalencoder', OrdinalEncoder(categories=[cut_categories, color_categories, clarity_categories])),
+                # Rank of each category (the codes of the schema's categoricals), missing values as NaN.
+                ('ordinalencoder', CategoricalCodeEncoder(categories=[cut_categories, color_categories, clarity_categories])),
+                ('imputer', SimpleImputer(strategy='most_frequent')),  # Fill missing values with the most frequent rank.
                 ('scaler', StandardScaler())  # Standardize features.
             ])
 
@@ -71,40 +233,53 @@ class DataTransformation:
     def initiate_data_transformation(self, train_path, test_path):
         """
         Reads training and testing datasets, applies the transformation, and saves the preprocessor.
+
+        Returns the (features, target) .npy paths of the train and test sets and the preprocessor path.
         """
         try:
-            # Read train and test datasets.
-            train_df = pd.read_csv(train_path)
-            test_df = pd.read_csv(test_path)
+            # Read train and test datasets with the declared compact dtypes.
+            train_df = read_dataset(train_path)
+            test_df = read_dataset(test_path)
 
             logging.info('Read train and test data completed')
-            logging.info(f'Train Dataframe Head : \n{train_df.head().to_string()}')
-            logging.info(f'Test Dataframe Head  : \n{test_df.head().to_string()}')
+            record_shape(*train_df.shape)
+            record_shape(*test_df.shape)
+            # Formatting the frames is costly, only do it when DEBUG logging is enabled
+            if logging.getLogger().isEnabledFor(logging.DEBUG):
+                logging.debug('Train Dataframe Head : \n%s', train_df.head().to_string())
+                logging.debug('Test Dataframe Head  : \n%s', test_df.head().to_string())
 
             logging.info('Obtaining preprocessing object')
 
             preprocessing_obj = self.get_data_transformation_object()  # Get the preprocessor.
 
-            # Define the target column and columns to drop.
-            target_column_name = 'price'
-            drop_columns = [target_column_name, 'id']
+            config = self.data_transformation_config
 
-            # Split features into independent (X) and dependent (y).
-            input_feature_train_df = train_df.drop(columns=drop_columns, axis=1)
-            target_feature_train_df = train_df[target_column_name]
-
-            input_feature_test_df = test_df.drop(columns=drop_columns, axis=1)
-            target_feature_test_df = test_df[target_column_name]
-
-            # Apply preprocessing to train and test datasets.
-            input_feature_train_arr = preprocessing_obj.fit_transform(input_feature_train_df)
-            input_feature_test_arr = preprocessing_obj.transform(input_feature_test_df)
+            # Fit the preprocessor on the training features block by block (the medians and scaling
+            # statistics still cover every training row). The ColumnTransformer selects its columns by name.
+            fit_in_chunks(preprocessing_obj, train_df, chunk_size=config.transform_chunk_size)
 
+            # Apply preprocessing to train and test datasets block by block, in parallel, straight
+            # into the memory-mapped .npy files. Besides the frames read above and the target
+            # arrays, only block-sized copies (and one column for the medians) are made.
             logging.info("Applying preprocessing object on training and testing datasets.")
+            for df, features_file_path, target_file_path in (
+                (train_df, config.train_features_file_path, config.train_target_file_path),
+                (test_df, config.test_features_file_path, config.test_target_file_path)
+            ):
+                os.makedirs(os.path.dirname(features_file_path), exist_ok=True)
+                n_features = len(preprocessing_obj.get_feature_names_out())
+                features = np.lib.format.open_memmap(
+                    features_file_path, mode='w+', dtype=np.float64, shape=(len(df), n_features)
+                )
+                transform_in_chunks(preprocessing_obj, df, out=features,
+                                    chunk_size=config.transform_chunk_size, n_jobs=config.n_jobs)
+                features.flush()
+                del features
+                # Save the target as a separate .npy artifact.
+                save_array(target_file_path, df[TARGET_COLUMN].to_numpy(dtype=np.float64))
 
-            # Combine transformed features with the target variable.
-            train_arr = np.c_[input_feature_train_arr, np.array(target_feature_train_df)]
-            test_arr = np.c_[input_feature_test_arr, np.array(target_feature_test_df)]
+            logging.info('Transformed train and test arrays are saved.')
 
             # Save the preprocessor object to disk.
             save_object(
@@ -114,7 +289,11 @@ class DataTransformation:
 
             logging.info('Processor pickle is created and saved.')
 
-            return train_arr, test_arr, self.data_transformation_config.preprocessor_obj_file_path
+            return (
+                (config.train_features_file_path, config.train_target_file_path),
+                (config.test_features_file_path, config.test_target_file_path),
+                self.data_transformation_config.preprocessor_obj_file_path
+            )
         except Exception as e:
             logging.info("Exception occurred in the initiate_data_transformation")
             raise CustomException(e, sys)
@@ -0,0 +1,219 @@
+import os  # Module for interacting with the operating system (e.g., file paths).
+import sys  # Provides system-specific parameters and functions.
+import json  # Writes the training report.
+import time  # Used for measuring the duration of the passes.
+from dataclasses import dataclass  # Simplifies the creation of configuration classes.
+import numpy as np  # For numerical operations.
+import pandas as pd  # For combining the sampled rows.
+from sklearn.linear_model import SGDRegressor  # Linear model trained chunk by chunk with partial_fit.
+from sklearn.preprocessing import StandardScaler  # Scalers fitted chunk by chunk with partial_fit.
+
+from src.exception import CustomException  # Custom exception class for handling errors.
+from src.logger import logging  # Custom logging module for logging events.
+from src.serialization import save_object  # Utility function to save serialized objects.
+from src.pipelines.model_registry import write_model_release  # Marks the saved pair as complete.
+from src.resource_tracker import record_shape  # Reports the size of the data to the run report.
+from src.schema import (  # Declared columns of the dataset and chunked reading.
+    NUMERICAL_COLUMNS, CATEGORICAL_COLUMNS, FEATURE_COLUMNS, CATEGORY_ORDERS, TARGET_COLUMN, iter_dataset
+)
+from src.components.data_ingestion import DataIngestionconfig  # Source dataset and split settings.
+from src.components.data_transformation import DataTransformation, DataTransformationconfig
+from src.components.model_trainer import ModelTrainerConfig  # Path of the trained model.
+
+
+@dataclass
+class IncrementalTrainerConfig:
+    source_data_path = DataIngestionconfig.source_data_path  # Dataset streamed in chunks.
+    test_size = DataIngestionconfig.test_size  # Fraction of the rows held out for evaluation.
+    random_state = DataIngestionconfig.random_state  # Seed of the split, the sample and the shuffling.
+    chunk_size = 100000  # Number of rows read at a time.
+    sample_size = 100000  # Training rows sampled to estimate the medians of the numerical columns.
+    n_epochs = 5  # Number of partial_fit passes over the training rows.
+    # The artifacts are the same pair as the in-memory training, so PredictPipeline serves them unchanged.
+    preprocessor_obj_file_path = DataTransformationconfig.preprocessor_obj_file_path
+    trained_model_file_path = ModelTrainerConfig.trained_model_file_path
+    report_file_path = os.path.join('artifacts', 'incremental_report.json')
+
+
+class IncrementalTrainer:
+    """
+    Trains the preprocessor and a linear model on a dataset larger than memory.
+
+    The source file is never loaded whole: every pass streams it in chunks and only keeps
+    one chunk, a bounded row sample and running statistics in memory. Each row is assigned
+    to the train or test split by a seeded random draw, so every pass sees the same split.
+    """
+    def __init__(self):
+        self.incremental_trainer_config = IncrementalTrainerConfig()
+        # Independent random streams for the split, the row sample and the shuffling of chunks
+        self.split_seed, self.sample_seed, self.shuffle_seed = np.random.SeedSequence(
+            self.incremental_trainer_config.random_state).spawn(3)
+
+    def get_model(self):
+        # Estimator trained chunk by chunk with partial_fit
+        return SGDRegressor(random_state=self.incremental_trainer_config.random_state)
+
+    def _iter_split(self, part):
+        """
+        Yields the rows of each chunk of the source dataset that belong to `part` ('train' or 'test').
+        """
+        config = self.incremental_trainer_config
+        rng = np.random.default_rng(self.split_seed)
+        for chunk in iter_dataset(config.source_data_path, config.chunk_size):
+            is_test = rng.random(len(chunk)) < config.test_size
+            rows = chunk[is_test] if part == 'test' else chunk[~is_test]
+            if len(rows):
+                yield rows
+
+    def fit_preprocessor(self):
+        """
+        Fits the preprocessor of DataTransformation with two streamed passes over the training rows.
+
+        The first pass keeps a uniform random sample of rows, used to fit the preprocessor and
+        estimate the medians of the numerical columns, and exact counts of every category for
+        the most frequent ones. The second pass fits the scalers on all the imputed rows with
+        StandardScaler.partial_fit.
+
+        Returns:
+            tuple: The fitted preprocessor and the number of training rows.
+        """
+        config = self.incremental_trainer_config
+        rng = np.random.default_rng(self.sample_seed)
+
+        # Pass 1: row sample and category counts
+        sample, sample_keys = None, None
+        counts = {col: np.zeros(len(CATEGORY_ORDERS[col]), dtype=np.int64) for col in CATEGORICAL_COLUMNS}
+        n_rows = 0
+        for chunk in self._iter_split('train'):
+            n_rows += len(chunk)
+            for col in CATEGORICAL_COLUMNS:
+                codes = chunk[col].cat.codes.to_numpy()
+                counts[col] += np.bincount(codes[codes >= 0], minlength=len(counts[col]))
+
+            # Every row draws a random key and the rows with the smallest keys are kept,
+            # which is a uniform sample of all the rows seen so far
+            keys = rng.random(len(chunk))
+            rows = chunk[FEATURE_COLUMNS]
+            if sample is not None:
+                rows = pd.concat([sample, rows])
+                keys = np.concatenate([sample_keys, keys])
+            keep = np.argsort(keys, kind='stable')[:config.sample_size]
+            sample, sample_keys = rows.iloc[keep], keys[keep]
+        if sample is None:
+            raise ValueError(f'No training rows found in {config.source_data_path}')
+        logging.info('Sampled %d of %d training rows', len(sample), n_rows)
+
+        preprocessor = DataTransformation().get_data_transformation_object()
+        preprocessor.fit(sample)
+        num_pipeline = preprocessor.named_transformers_['num_pipeline']
+        cat_pipeline = preprocessor.named_transformers_['cat_pipeline']
+        # The most frequent categories come from the exact counts rather than from the sample
+        cat_pipeline.named_steps['imputer'].statistics_ = np.array(
+            [np.argmax(counts[col]) for col in CATEGORICAL_COLUMNS], dtype=np.float64)
+
+        # Pass 2: means and variances of the imputed columns over all the training rows
+        num_scaler, cat_scaler = StandardScaler(), StandardScaler()
+        for chunk in self._iter_split('train'):
+            num_scaler.partial_fit(num_pipeline[:-1].transform(chunk[NUMERICAL_COLUMNS]))
+            cat_scaler.partial_fit(cat_pipeline[:-1].transform(chunk[CATEGORICAL_COLUMNS]))
+        num_pipeline.set_params(scaler=num_scaler)
+        cat_pipeline.set_params(scaler=cat_scaler)
+        logging.info('Preprocessor fitted on %d training rows', n_rows)
+
+        return preprocessor, n_rows
+
+    def evaluate(self, preprocessor, model):
+        """
+        Scores the model on the test rows, one chunk at a time.
+
+        Returns:
+            dict: R2 score, MAE and RMSE over all the test rows, and the number of rows.
+        """
+        n_rows, target_mean, target_m2 = 0, 0.0, 0.0
+        squared_error, absolute_error = 0.0, 0.0
+        for chunk in self._iter_split('test'):
+            y = chunk[TARGET_COLUMN].to_numpy(dtype=np.float64)
+            pred = model.predict(preprocessor.transform(chunk[FEATURE_COLUMNS]))
+            squared_error += float(np.sum((y - pred) ** 2))
+            absolute_error += float(np.sum(np.abs(y - pred)))
+
+            # Running mean and sum of squared deviations of the target, merged chunk by chunk
+            chunk_mean = float(np.mean(y))
+            delta = chunk_mean - target_mean
+            total = n_rows + len(y)
+            target_m2 += float(np.sum((y - chunk_mean) ** 2)) + delta ** 2 * n_rows * len(y) / total
+            target_mean += delta * len(y) / total
+            n_rows = total
+        if not n_rows:
+            raise ValueError('No test rows to evaluate the model on')
+
+        return {
+            'r2_score': 1.0 - squared_error / target_m2,
+            'mae': absolute_error / n_rows,
+            'rmse': float(np.sqrt(squared_error / n_rows)),
+            'rows': n_rows
+        }
+
+    def initiate_incremental_training(self):
+        """
+        Streams the source dataset to fit the preprocessor and train the model with partial_fit,
+        evaluates it on the test rows, and saves preprocessor.pkl and model.pkl.
+
+        Memory use is bounded by chunk_size and sample_size, whatever the size of the dataset.
+        The epochs and test scores are saved to incremental_report.json.
+        """
+        try:
+            config = self.incremental_trainer_config
+            start = time.perf_counter()
+
+            preprocessor, n_train = self.fit_preprocessor()
+            record_shape(n_train, len(FEATURE_COLUMNS))
+
+            model = self.get_model()
+            rng = np.random.default_rng(self.shuffle_seed)
+            epochs = []
+            for epoch in range(config.n_epochs):
+                epoch_start = time.perf_counter()
+                squared_error, n_rows = 0.0, 0
+                for chunk in self._iter_split('train'):
+                    X = preprocessor.transform(chunk[FEATURE_COLUMNS])
+                    y = chunk[TARGET_COLUMN].to_numpy(dtype=np.float64)
+                    # Progressive validation: each chunk is scored before the model learns from it
+                    if hasattr(model, 'coef_'):
+                        squared_error += float(np.sum((y - model.predict(X)) ** 2))
+                        n_rows += len(y)
+                    # partial_fit does not shuffle, so shuffle the rows of the chunk
+                    order = rng.permutation(len(y))
+                    model.partial_fit(X[order], y[order])
+                epochs.append({
+                    'epoch': epoch + 1,
+                    'train_rmse': float(np.sqrt(squared_error / n_rows)) if n_rows else None,
+                    'seconds': time.perf_counter() - epoch_start
+                })
+                logging.info('Epoch %d done in %.2fs, progressive train RMSE %s',
+                             epoch + 1, epochs[-1]['seconds'], epochs[-1]['train_rmse'])
+
+            test_scores = self.evaluate(preprocessor, model)
+            print(f'Incremental Model : {type(model).__name__} , R2 Score : {test_scores["r2_score"]}')
+            print('\n====================================================================================\n')
+            logging.info('Incremental training done, test scores %s', test_scores)
+
+            save_object(file_path=config.preprocessor_obj_file_path, obj=preprocessor)
+            save_object(file_path=config.trained_model_file_path, obj=model)
+            write_model_release(config.preprocessor_obj_file_path, config.trained_model_file_path)
+            with open(config.report_file_path, 'w') as file_obj:
+                json.dump({
+                    'model': type(model).__name__,
+                    'train_rows': n_train,
+                    'chunk_size': config.chunk_size,
+                    'sample_size': config.sample_size,
+                    'epochs': epochs,
+                    'test': test_scores,
+                    'seconds': time.perf_counter() - start
+                }, file_obj, indent=2)
+
+            return config.preprocessor_obj_file_path, config.trained_model_file_path
+
+        except Exception as e:
+            logging.info('Exception occured at Incremental Training')
+            raise CustomException(e, sys)
@@ -1,69 +1,267 @@
 # Basic Import
 import numpy as np
-import pandas as pd
 from sklearn.linear_model import LinearRegression, Ridge,Lasso,ElasticNet
 from sklearn.tree import DecisionTreeRegressor
+from sklearn.metrics import r2_score
+from sklearn.experimental import enable_halving_search_cv  # noqa: F401 (enables HalvingGridSearchCV)
+from sklearn.model_selection import HalvingGridSearchCV
 from src.exception import CustomException
 from src.logger import logging
 
-from src.utils import save_object
+from src.serialization import save_object
+from src.serialization import load_array
 from src.utils import evaluate_model
+from src.utils import cross_validate_models
+from src.resource_tracker import record_shape, annotate
+from src.pipelines.model_registry import write_model_release
+from src.components.data_transformation import DataTransformation, DataTransformationconfig
+from src.schema import ID_COLUMN, TARGET_COLUMN, read_dataset
 
 from dataclasses import dataclass
 import sys
 import os
+import json
+import time
 
 @dataclass 
 class ModelTrainerConfig:
     trained_model_file_path = os.path.join('artifacts','model.pkl')
+    n_jobs = -1  # Number of models fitted concurrently (-1 uses all cores)
+    # Hyperparameter search (successive halving over growing subsets of the training rows)
+    search_report_file_path = os.path.join('artifacts','model_search.json')
+    search_factor = 3  # Only the best 1/factor candidates survive each round, on factor times more rows
+    search_cv = 3  # Folds used to score the candidates of each round
+    search_min_resources = 2000  # Training rows used in the first round
+    random_state = 42
+    # K-fold cross-validation
+    cv_folds = 5  # Number of folds
+    cv_cache_dir = os.path.join('artifacts','cv_cache')  # Cache of the transformed fold matrices
+    cv_report_file_path = os.path.join('artifacts','cv_report.json')
 
 
 class ModelTrainer:
     def __init__(self):
         self.model_trainer_config = ModelTrainerConfig()
 
-    def initate_model_training(self,train_array,test_array):
-        try:
-            logging.info('Splitting Dependent and Independent variables from train and test data')
-            X_train, y_train, X_test, y_test = (
-                train_array[:,:-1],
-                train_array[:,-1],
-                test_array[:,:-1],
-                test_array[:,-1]
-            )
-
-            models={
+    def get_models(self):
+        # Candidate models evaluated by initate_model_training
+        return {
             'LinearRegression':LinearRegression(),
             'Lasso':Lasso(),
             'Ridge':Ridge(),
             'Elasticnet':ElasticNet(),
             'DecisionTree':DecisionTreeRegressor()
         }
+
+    def get_param_spaces(self):
+        # Parameter grids explored by initiate_model_search for each candidate model
+        return {
+            'LinearRegression':{'fit_intercept':[True]},
+            'Lasso':{'alpha':np.logspace(-3,2,11).tolist()},
+            'Ridge':{'alpha':np.logspace(-3,3,13).tolist()},
+            'Elasticnet':{'alpha':np.logspace(-3,1,9).tolist(),'l1_ratio':[0.1,0.5,0.9]},
+            'DecisionTree':{
+                'max_depth':[None,8,12,16,24],
+                'min_samples_split':[2,10,20],
+                'min_samples_leaf':[1,2,5,10]
+            }
+        }
+
+    def _load_arrays(self,train_paths,test_paths):
+        # train_paths/test_paths are (features, target) .npy paths, by default the ones
+        # written by DataTransformation, so a retrain can skip ingestion and transformation
+        transformation_config = DataTransformationconfig()
+        train_paths = train_paths or (transformation_config.train_features_file_path,
+                                      transformation_config.train_target_file_path)
+        test_paths = test_paths or (transformation_config.test_features_file_path,
+                                    transformation_config.test_target_file_path)
+
+        logging.info('Memory-mapping Dependent and Independent variables of train and test data')
+        return (
+            load_array(train_paths[0]),
+            load_array(train_paths[1]),
+            load_array(test_paths[0]),
+            load_array(test_paths[1])
+        )
+
+    def _release(self):
+        # model.pkl now pairs with the saved preprocessor.pkl: let the serving registry load them
+        write_model_release(DataTransformationconfig().preprocessor_obj_file_path,
+                            self.model_trainer_config.trained_model_file_path)
+
+    def initate_model_training(self,train_paths=None,test_paths=None):
+        try:
+            X_train, y_train, X_test, y_test = self._load_arrays(train_paths,test_paths)
+            record_shape(*X_train.shape)
+
+            models=self.get_models()
             
-            model_report:dict=evaluate_model(X_train,y_train,X_test,y_test,models)
+            model_report, fitted_models = evaluate_model(
+                X_train,y_train,X_test,y_test,models,n_jobs=self.model_trainer_config.n_jobs
+            )
             print(model_report)
             print('\n====================================================================================\n')
-            logging.info(f'Model Report : {model_report}')
+            logging.info('Model Report : %s', model_report)
+            # Time and memory of every candidate model, for the training run report
+            annotate(models=model_report)
 
             # To get best model score from dictionary 
-            best_model_score = max(sorted(model_report.values()))
+            best_model_name = max(model_report, key=lambda name: model_report[name]['r2_score'])
+            best_model_score = model_report[best_model_name]['r2_score']
 
-            best_model_name = list(model_report.keys())[
-                list(model_report.values()).index(best_model_score)
-            ]
-            
-            best_model = models[best_model_name]
+            # The best model was already fitted by evaluate_model, no need to refit it
+            best_model = fitted_models[best_model_name]
 
             print(f'Best Model Found , Model Name : {best_model_name} , R2 Score : {best_model_score}')
             print('\n====================================================================================\n')
-            logging.info(f'Best Model Found , Model Name : {best_model_name} , R2 Score : {best_model_score}')
+            logging.info('Best Model Found , Model Name : %s , R2 Score : %s', best_model_name, best_model_score)
 
             save_object(
                  file_path=self.model_trainer_config.trained_model_file_path,
                  obj=best_model
             )
+            self._release()
           
 
         except Exception as e:
             logging.info('Exception occured at Model Training')
-            raise CustomException(e,sys)
\ No newline at end of file
+            raise CustomException(e,sys)
+
+    def initiate_model_search(self,train_paths=None,test_paths=None):
+        """
+        Tunes every candidate model with successive halving and saves the best one.
+
+        Each model's parameter grid is searched with HalvingGridSearchCV: all configurations
+        are scored on a small subset of the training rows, and only the best ones are kept
+        and rescored on growing subsets. Candidates are fitted in parallel across cores. The
+        best configuration of each model is then compared on the test set, and the winner is
+        saved to model.pkl with the search log and timings in model_search.json.
+        """
+        try:
+            X_train, y_train, X_test, y_test = self._load_arrays(train_paths,test_paths)
+            record_shape(*X_train.shape)
+            config = self.model_trainer_config
+
+            models=self.get_models()
+            param_spaces=self.get_param_spaces()
+            search_report={}
+            best_models={}
+
+            for model_name, model in models.items():
+                start=time.perf_counter()
+                search=HalvingGridSearchCV(
+                    model,
+                    param_spaces[model_name],
+                    factor=config.search_factor,
+                    resource='n_samples',
+                    min_resources=min(config.search_min_resources,len(X_train)),
+                    cv=config.search_cv,
+                    scoring='r2',
+                    n_jobs=config.n_jobs,
+                    random_state=config.random_state,
+                    refit=True
+                )
+                search.fit(X_train,y_train)
+                search_seconds=time.perf_counter()-start
+
+                best_models[model_name]=search.best_estimator_
+                test_score=r2_score(y_test,search.best_estimator_.predict(X_test))
+                results=search.cv_results_
+                search_report[model_name]={
+                    'best_params':search.best_params_,
+                    'cv_r2_score':float(search.best_score_),
+                    'test_r2_score':float(test_score),
+                    'search_seconds':search_seconds,
+                    'n_candidates':[int(n) for n in search.n_candidates_],
+                    'n_resources':[int(n) for n in search.n_resources_],
+                    'log':[
+                        {
+                            'iter':int(results['iter'][i]),
+                            'n_resources':int(results['n_resources'][i]),
+                            'params':results['params'][i],
+                            'mean_test_score':float(results['mean_test_score'][i]),
+                            'mean_fit_time':float(results['mean_fit_time'][i])
+                        }
+                        for i in range(len(results['params']))
+                    ]
+                }
+                logging.info('Search for %s done in %.2fs, best params %s, test R2 %s',
+                             model_name,search_seconds,search.best_params_,test_score)
+
+            # Pick the best tuned model on the test set, as initate_model_training does
+            best_model_name=max(search_report,key=lambda name: search_report[name]['test_r2_score'])
+            best_model=best_models[best_model_name]
+
+            print(f'Best Model Found , Model Name : {best_model_name} , '
+                  f'R2 Score : {search_report[best_model_name]["test_r2_score"]} , '
+                  f'Params : {search_report[best_model_name]["best_params"]}')
+            print('\n====================================================================================\n')
+
+            save_object(
+                 file_path=config.trained_model_file_path,
+                 obj=best_model
+            )
+            self._release()
+            with open(config.search_report_file_path,'w') as file_obj:
+                json.dump({'best_model':best_model_name,'models':search_report},file_obj,indent=2,default=str)
+            logging.info('Best tuned model %s saved with its search report',best_model_name)
+
+        except Exception as e:
+            logging.info('Exception occured at Model Search')
+            raise CustomException(e,sys)
+
+    def initiate_cross_validation(self,train_data_path,train_paths=None,test_paths=None):
+        """
+        Selects the best model with k-fold cross-validation on the training data, then fits it
+        on the whole transformed training set and saves it.
+
+        Each fold's preprocessing is fitted once and cached, and reused by every candidate
+        model. The mean/std of R2, MAE and RMSE per model are saved to cv_report.json.
+        """
+        try:
+            config = self.model_trainer_config
+
+            train_df = read_dataset(train_data_path)
+            X = train_df.drop(columns=[TARGET_COLUMN,ID_COLUMN])
+            record_shape(*X.shape)
+            y = train_df[TARGET_COLUMN].to_numpy(dtype=np.float64)
+            preprocessor = DataTransformation().get_data_transformation_object()
+
+            models=self.get_models()
+            cv_report=cross_validate_models(
+                X,y,preprocessor,models,
+                n_splits=config.cv_folds,
+                n_jobs=config.n_jobs,
+                cache_dir=config.cv_cache_dir,
+                random_state=config.random_state
+            )
+            print(cv_report)
+            print('\n====================================================================================\n')
+            logging.info('Cross-validation Report : %s', cv_report)
+
+            # Select the model with the best mean R2 across the folds
+            best_model_name=max(cv_report,key=lambda name: cv_report[name]['r2_score_mean'])
+
+            # Fit the selected model on the whole (already transformed) training set
+            X_train, y_train, X_test, y_test = self._load_arrays(train_paths,test_paths)
+            best_model=models[best_model_name].fit(X_train,y_train)
+            test_score=r2_score(y_test,best_model.predict(X_test))
+
+            print(f'Best Model Found , Model Name : {best_model_name} , '
+                  f'CV R2 Score : {cv_report[best_model_name]["r2_score_mean"]} , Test R2 Score : {test_score}')
+            print('\n====================================================================================\n')
+            logging.info('Best Model Found , Model Name : %s , CV R2 Score : %s , Test R2 Score : %s',
+                         best_model_name,cv_report[best_model_name]['r2_score_mean'],test_score)
+
+            save_object(
+                 file_path=config.trained_model_file_path,
+                 obj=best_model
+            )
+            self._release()
+            with open(config.cv_report_file_path,'w') as file_obj:
+                json.dump({'best_model':best_model_name,'test_r2_score':test_score,'folds':config.cv_folds,
+                           'models':cv_report},file_obj,indent=2)
+
+        except Exception as e:
+            logging.info('Exception occured at Model Cross-validation')
+            raise CustomException(e,sys)
@@ -0,0 +1,196 @@
+import os  # Module for interacting with the operating system (e.g., file paths).
+import sys  # Provides system-specific parameters and functions.
+from dataclasses import dataclass  # Simplifies the creation of configuration classes.
+import numpy as np  # For numerical operations.
+
+from src.exception import CustomException  # Custom exception class for handling errors.
+from src.logger import logging  # Custom logging module for logging events.
+from src.serialization import save_object, load_object  # Utility functions to save/load serialized objects.
+from src.pipelines.fast_scorer import FastScorer  # NumPy-only scorer built by this component.
+from src.pipelines.scorer_artifact import ScorerArtifactConfig, save_scorer_artifact  # Array artifact format.
+from src.schema import read_dataset  # Reads the check data with its declared dtypes.
+
+
+@dataclass
+class ScorerExporterConfig:
+    fast_scorer_file_path = os.path.join('artifacts', 'fast_scorer.pkl')
+    # Path to save the exported NumPy scorer.
+    artifact_dir_path = ScorerArtifactConfig.artifact_dir_path
+    # Directory of the versioned, checksummed array artifact of the same scorer.
+    check_rows = 10000
+    # Number of rows used to check the scorer against the preprocessor and model.
+    tolerance = 1e-6
+    # Maximum relative difference allowed between the scorer and the model.
+
+
+def _scaler_params(scaler, n_features):
+    """
+    Returns the (mean, scale) a fitted StandardScaler (or no scaler) applies.
+    """
+    mean = np.zeros(n_features)
+    scale = np.ones(n_features)
+    if scaler is not None:
+        if scaler.with_mean:
+            mean = np.asarray(scaler.mean_, dtype=np.float64)
+        if scaler.with_std:
+            scale = np.asarray(scaler.scale_, dtype=np.float64)
+    return mean, scale
+
+
+def _pipeline_steps(pipeline, allowed):
+    """
+    Returns the steps of a fitted pipeline keyed by class name, rejecting unsupported steps.
+    """
+    steps = {}
+    for _, step in pipeline.steps:
+        name = type(step).__name__
+        if name not in allowed:
+            raise ValueError(f"Cannot export preprocessing step {name}")
+        steps[name] = step
+    return steps
+
+
+def _float32_thresholds(threshold):
+    """
+    Converts tree thresholds to float32 without changing any split decision.
+
+    Trees compare float32 features with float64 thresholds. Rounding each threshold down to
+    the largest float32 not above it keeps `x <= threshold` identical for every float32 x.
+    """
+    compact = threshold.astype(np.float32)
+    rounded_up = compact.astype(np.float64) > threshold
+    compact[rounded_up] = np.nextafter(compact[rounded_up], np.float32(-np.inf))
+    return compact
+
+
+class ScorerExporter:
+    def __init__(self):
+        self.scorer_exporter_config = ScorerExporterConfig()
+
+    def build_scorer(self, preprocessor, model):
+        """
+        Folds a fitted preprocessor and model into a FastScorer.
+
+        Args:
+            preprocessor (ColumnTransformer): Fitted preprocessor from DataTransformation.
+            model: Fitted linear model (coef_/intercept_) or DecisionTreeRegressor.
+
+        Returns:
+            FastScorer: The equivalent NumPy scorer.
+        """
+        try:
+            numerical_columns, categorical_columns = [], []
+            num_steps, cat_steps = None, None
+            for name, transformer, columns in preprocessor.transformers_:
+                if name == 'num_pipeline':
+                    numerical_columns, num_steps = list(columns), _pipeline_steps(
+                        transformer, ('SimpleImputer', 'StandardScaler'))
+                elif name == 'cat_pipeline':
+                    categorical_columns, cat_steps = list(columns), _pipeline_steps(
+                        transformer, ('SimpleImputer', 'OrdinalEncoder', 'CategoricalCodeEncoder', 'StandardScaler'))
+                elif transformer != 'drop':
+                    raise ValueError(f"Cannot export transformer {name}")
+
+            # Numerical branch: median imputation, then standard scaling, computed in the dtype
+            # the preprocessor was fitted on (float32 for the schema's compact columns).
+            numerical_fill = num_steps['SimpleImputer'].statistics_.astype(np.float64)
+            numerical_dtype = num_steps['SimpleImputer'].statistics_.dtype
+            numerical_mean, numerical_scale = _scaler_params(
+                num_steps.get('StandardScaler'), len(numerical_columns))
+
+            # Categorical branch: most frequent imputation, ordinal codes, then standard scaling.
+            if 'CategoricalCodeEncoder' in cat_steps:
+                # Codes first, then the most frequent code is imputed
+                categories = cat_steps['CategoricalCodeEncoder'].categories_
+                categorical_fill = [str(cats[int(code)]) for cats, code in
+                                    zip(categories, cat_steps['SimpleImputer'].statistics_)]
+            else:
+                # Older preprocessors impute the most frequent category, then encode it
+                categories = cat_steps['OrdinalEncoder'].categories_
+                categorical_fill = [str(value) for value in cat_steps['SimpleImputer'].statistics_]
+            cat_mean, cat_scale = _scaler_params(
+                cat_steps.get('StandardScaler'), len(categorical_columns))
+            categorical_values = [
+                (np.arange(len(cats), dtype=np.float64) - cat_mean[j]) / cat_scale[j]
+                for j, cats in enumerate(categories)
+            ]
+
+            if hasattr(model, 'tree_'):
+                # Tree models: keep the scaled lookups and flatten the fitted tree.
+                kind = 'tree'
+                tree = model.tree_
+                model_params = {
+                    'feature': tree.feature.astype(np.int32),
+                    'threshold': _float32_thresholds(tree.threshold),
+                    'children_left': tree.children_left.astype(np.int32),
+                    'children_right': tree.children_right.astype(np.int32),
+                    # Leaf values stay float64, float32 would change the predictions
+                    'value': tree.value.reshape(tree.node_count).astype(np.float64),
+                }
+            elif hasattr(model, 'coef_'):
+                # Linear models: fold the scaling into the coefficients and the intercept.
+                kind = 'linear'
+                coef = np.asarray(model.coef_, dtype=np.float64).ravel()
+                num_coef = coef[:len(numerical_columns)]
+                cat_coef = coef[len(numerical_columns):]
+                categorical_values = [cat_coef[j] * values for j, values in enumerate(categorical_values)]
+                intercept = float(np.ravel(model.intercept_)[0])
+                if numerical_dtype == np.float64:
+                    model_params = {
+                        'coef': num_coef / numerical_scale,
+                        'intercept': intercept - float(np.sum(num_coef * numerical_mean / numerical_scale)),
+                        'folded': True,
+                    }
+                else:
+                    # The float32 rounding of the scaled values cannot be folded: keep the scaling
+                    model_params = {'coef': num_coef, 'intercept': intercept, 'folded': False}
+            else:
+                raise ValueError(f"Cannot export model {type(model).__name__}")
+
+            categorical_tables = [
+                {str(category): float(value) for category, value in zip(cats, values)}
+                for cats, values in zip(categories, categorical_values)
+            ]
+
+            return FastScorer(kind, numerical_columns, numerical_fill, numerical_mean, numerical_scale,
+                              categorical_columns, categorical_tables, categorical_fill, model_params,
+                              numerical_dtype=numerical_dtype)
+        except Exception as e:
+            logging.info('Exception occurred while building the fast scorer')
+            raise CustomException(e, sys)
+
+    def initiate_scorer_export(self, preprocessor_path, model_path, test_path=None):
+        """
+        Exports the saved preprocessor and model as a FastScorer, both pickled and as the
+        versioned array artifact that ModelRegistry can serve (MODEL_ARTIFACT_FORMAT=array).
+
+        If a test file is given, the scorer is checked against the preprocessor and model on
+        its first rows and the export fails when the predictions do not agree.
+        """
+        try:
+            preprocessor = load_object(preprocessor_path)
+            model = load_object(model_path)
+            scorer = self.build_scorer(preprocessor, model)
+            logging.info('Fast scorer built for a %s model', scorer.kind)
+
+            if test_path is not None:
+                test_df = read_dataset(test_path, nrows=self.scorer_exporter_config.check_rows)
+                expected = model.predict(preprocessor.transform(test_df))
+                actual = scorer.predict(test_df)
+                if not np.allclose(actual, expected, rtol=self.scorer_exporter_config.tolerance, atol=1e-6):
+                    raise ValueError('Fast scorer predictions do not match the model predictions')
+                logging.info('Fast scorer checked against the model on %d rows', len(test_df))
+
+            save_object(
+                file_path=self.scorer_exporter_config.fast_scorer_file_path,
+                obj=scorer
+            )
+            logging.info('Fast scorer pickle is created and saved.')
+
+            # Same scorer as memory-mappable arrays with a checksummed manifest, for fast loading.
+            save_scorer_artifact(scorer, self.scorer_exporter_config.artifact_dir_path)
+
+            return self.scorer_exporter_config.fast_scorer_file_path
+        except Exception as e:
+            logging.info('Exception occurred in initiate_scorer_export')
+            raise CustomException(e, sys)
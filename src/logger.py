@@ -1,30 +1,139 @@
 # Import necessary modules
 import logging  # Provides a way to track events that happen during program execution
+import logging.handlers  # Queue-based and rotating handlers
 import os       # Helps interact with the operating system, e.g., managing file paths
-from datetime import datetime  # Used for fetching the current date and time
+import queue    # In-memory queue between the logging threads and the writer thread
+import atexit   # Flushes the queued records when the process exits
 
-# Generate a log file name with a timestamp (e.g., "01_16_2025_14_30_45.log")
-LOG_FILE = f"{datetime.now().strftime('%m_%d_%Y_%H_%M_%S')}.log"
-
-# Define the directory path where log files will be stored
-# This combines the current working directory with a folder named 'logs' and the log file name
-logs_path = os.path.join(os.getcwd(), "logs", LOG_FILE)
+# Logging settings, all overridable through the environment:
+# - LOG_DIR: directory holding the log files (default: ./logs)
+# - LOG_FILE: name of the log file (default: app.log), suffixed with the process id (app.<pid>.log)
+# - LOG_LEVEL: minimum level written (default: INFO)
+# - LOG_MAX_BYTES / LOG_BACKUP_COUNT: size-based rotation and number of rotated files kept
+# - LOG_ROTATE_WHEN: time-based rotation instead (e.g. 'midnight' or 'H'), see TimedRotatingFileHandler
+# - LOG_KEEP_PROCESSES: number of exited processes whose log files are kept in LOG_DIR (default: 50);
+#   the files of running processes are never removed
+LOG_DIR = os.environ.get('LOG_DIR', os.path.join(os.getcwd(), "logs"))
+LOG_FILE = os.environ.get('LOG_FILE', 'app.log')
+LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO').upper()
+LOG_MAX_BYTES = int(os.environ.get('LOG_MAX_BYTES', 10 * 1024 * 1024))
+LOG_BACKUP_COUNT = int(os.environ.get('LOG_BACKUP_COUNT', 5))
+LOG_ROTATE_WHEN = os.environ.get('LOG_ROTATE_WHEN')
+LOG_KEEP_PROCESSES = int(os.environ.get('LOG_KEEP_PROCESSES', 50))
 
 # Create the 'logs' directory if it doesn't already exist
-os.makedirs(logs_path, exist_ok=True)
+os.makedirs(LOG_DIR, exist_ok=True)
 
-# Define the complete path for the log file (directory + file name)
-LOG_FILE_PATH = os.path.join(logs_path, LOG_FILE)
+LOG_FILE_STEM, LOG_FILE_EXT = os.path.splitext(LOG_FILE)
 
-# Configure the logging settings
-logging.basicConfig(
-    filename=LOG_FILE_PATH,  # The log file where logs will be written
-    format="[ %(asctime)s ] %(lineno)d %(name)s - %(levelname)s - %(message)s", 
+formatter = logging.Formatter(
+    "[ %(asctime)s ] %(lineno)d %(name)s - %(levelname)s - %(message)s"
     # Log message format:
     # - %(asctime)s: Timestamp of the log entry
     # - %(lineno)d: Line number in the code where the log was called
     # - %(name)s: Logger name
     # - %(levelname)s: Severity level of the log (e.g., INFO, DEBUG, WARNING)
     # - %(message)s: The log message provided by the developer
-    level=logging.INFO  # Set the logging level to INFO (logs INFO and more critical levels)
 )
+
+
+def process_log_path(pid=None):
+    """
+    Returns the path of the log file of a process (the current one by default).
+    """
+    return os.path.join(LOG_DIR, f"{LOG_FILE_STEM}.{pid or os.getpid()}{LOG_FILE_EXT}")
+
+
+def _make_file_handler():
+    # The file handler does the actual writes, with size or time based rotation and retention.
+    # Rotating one file from several processes is unsupported (each one would rename it under
+    # the others), so every process (gunicorn workers, joblib/process pool workers, CLI runs)
+    # writes and rotates its own file.
+    path = process_log_path()
+    if LOG_ROTATE_WHEN:
+        handler = logging.handlers.TimedRotatingFileHandler(
+            path, when=LOG_ROTATE_WHEN, backupCount=LOG_BACKUP_COUNT, delay=True
+        )
+    else:
+        handler = logging.handlers.RotatingFileHandler(
+            path, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT, delay=True
+        )
+    handler.setFormatter(formatter)
+    return handler
+
+
+def _pid_alive(pid):
+    """
+    Returns whether a process with this id is running (assumed so where it cannot be checked).
+    """
+    if os.name == 'nt':
+        return True  # os.kill would terminate the process on Windows
+    try:
+        os.kill(pid, 0)  # Signal 0 only checks that the process exists
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True  # Exists, but belongs to another user
+    return True
+
+
+def _prune_process_logs():
+    # Remove the files (and rotated backups) of the oldest exited processes beyond
+    # LOG_KEEP_PROCESSES; the files of running processes (e.g. the other gunicorn workers) are kept
+    prefix = f"{LOG_FILE_STEM}."
+    processes = {}
+    try:
+        with os.scandir(LOG_DIR) as entries:
+            for entry in entries:
+                pid = entry.name[len(prefix):].split('.', 1)[0]
+                if entry.name.startswith(prefix) and pid.isdigit() and entry.is_file():
+                    files = processes.setdefault(int(pid), [])
+                    files.append((entry.stat().st_mtime, entry.path))
+    except OSError:
+        return
+    exited = [files for pid, files in processes.items() if pid != os.getpid() and not _pid_alive(pid)]
+    oldest_first = sorted(exited, key=lambda files: max(files)[0])
+    for files in oldest_first[:max(len(oldest_first) - LOG_KEEP_PROCESSES, 0)]:
+        for _, path in files:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+_prune_process_logs()
+file_handler = _make_file_handler()
+LOG_FILE_PATH = process_log_path()
+
+# Request threads only put records on a queue; a background listener thread writes them,
+# so no request ever waits on file I/O
+log_queue = queue.SimpleQueue()
+listener = logging.handlers.QueueListener(log_queue, file_handler, respect_handler_level=True)
+
+root_logger = logging.getLogger()
+root_logger.setLevel(LOG_LEVEL)
+queue_handler = logging.handlers.QueueHandler(log_queue)
+root_logger.addHandler(queue_handler)
+
+listener.start()
+atexit.register(listener.stop)
+
+
+def _restart_listener():
+    # The listener thread does not survive fork(): start a new one in the child process, on a
+    # fresh queue so records still queued by the parent are not written a second time, and
+    # writing to the child's own log file
+    global file_handler, LOG_FILE_PATH, listener
+    file_handler.close()  # Only closes the child's copy of the parent's file
+    file_handler = _make_file_handler()
+    LOG_FILE_PATH = process_log_path()
+    child_queue = queue.SimpleQueue()
+    queue_handler.queue = child_queue
+    atexit.unregister(listener.stop)  # The parent's listener thread does not exist in the child
+    listener = logging.handlers.QueueListener(child_queue, file_handler, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_restart_listener)
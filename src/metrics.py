@@ -0,0 +1,182 @@
+# Import necessary modules
+import time  # High resolution timers for the latency histograms
+import bisect  # Finds the histogram bucket of an observation
+import threading  # Guards metric updates across request threads
+from contextlib import contextmanager  # Used to time a block of code
+
+# Default latency buckets (seconds), from 100 microseconds to 10 seconds.
+DEFAULT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{value}"' for name, value in labels) + '}'
+
+
+class Counter:
+    """
+    A monotonically increasing count.
+    """
+    def __init__(self):
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1):
+        with self._lock:
+            self.value += amount
+
+    def samples(self, name, labels):
+        yield f'{name}{_format_labels(labels)} {self.value}'
+
+
+class Histogram:
+    """
+    Counts observations in cumulative buckets, Prometheus style.
+    """
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+
+    @contextmanager
+    def time(self):
+        """
+        Observes the duration of the enclosed block, in seconds.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+    def samples(self, name, labels):
+        # Read a consistent snapshot, so that the +Inf bucket always equals the count
+        with self._lock:
+            counts, total, count = list(self.counts), self.sum, self.count
+        cumulative = 0
+        for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+            cumulative += bucket_count
+            le = '+Inf' if bound == float('inf') else repr(bound)
+            yield f'{name}_bucket{_format_labels(labels + (("le", le),))} {cumulative}'
+        yield f'{name}_sum{_format_labels(labels)} {total}'
+        yield f'{name}_count{_format_labels(labels)} {count}'
+
+
+class Metric:
+    """
+    A named metric with one child Counter/Histogram per combination of label values.
+    """
+    def __init__(self, name, documentation, kind, label_names=(), **kwargs):
+        self.name = name
+        self.documentation = documentation
+        self.kind = kind
+        self.label_names = tuple(label_names)
+        self._kwargs = kwargs
+        self._children = {}
+        self._lock = threading.Lock()
+
+    def labels(self, **label_values):
+        key = tuple(str(label_values[name]) for name in self.label_names)
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.get(key)
+                if child is None:
+                    child = (Counter if self.kind == 'counter' else Histogram)(**self._kwargs)
+                    self._children[key] = child
+        return child
+
+    # Shortcuts for metrics without labels.
+    def inc(self, amount=1):
+        self.labels().inc(amount)
+
+    def observe(self, value):
+        self.labels().observe(value)
+
+    def time(self):
+        return self.labels().time()
+
+    def render(self):
+        yield f'# HELP {self.name} {self.documentation}'
+        yield f'# TYPE {self.name} {self.kind}'
+        # Snapshot the children, since request threads can add label sets during a scrape
+        with self._lock:
+            children = sorted(self._children.items())
+        for key, child in children:
+            yield from child.samples(self.name, tuple(zip(self.label_names, key)))
+
+
+class MetricsRegistry:
+    """
+    Holds every metric of the process and renders them in the Prometheus text format.
+    """
+    def __init__(self):
+        self._metrics = []
+        self._callbacks = []
+
+    def counter(self, name, documentation, label_names=()):
+        metric = Metric(name, documentation, 'counter', label_names)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name, documentation, label_names=(), buckets=DEFAULT_BUCKETS):
+        metric = Metric(name, documentation, 'histogram', label_names, buckets=buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def gauge(self, name, documentation, func):
+        """
+        Registers a gauge whose value is read from `func()` when the metrics are rendered.
+        `func` returns a number, or None to leave the gauge out.
+        """
+        self._callbacks.append((name, documentation, 'gauge', func))
+
+    def counter_func(self, name, documentation, func):
+        """
+        Registers a counter whose value is read from `func()` when the metrics are rendered,
+        for counts kept by another object. `func` returns a number that never decreases, or
+        None to leave the counter out. By convention, `name` ends with '_total'.
+        """
+        self._callbacks.append((name, documentation, 'counter', func))
+
+    def render(self):
+        """
+        Returns every metric in the Prometheus text exposition format.
+        """
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        for name, documentation, kind, func in self._callbacks:
+            value = func()
+            if value is None:
+                continue
+            lines.append(f'# HELP {name} {documentation}')
+            lines.append(f'# TYPE {name} {kind}')
+            lines.append(f'{name} {value}')
+        return '\n'.join(lines) + '\n'
+
+
+# Process-wide registry and the serving metrics.
+REGISTRY = MetricsRegistry()
+
+REQUESTS = REGISTRY.counter('diamond_requests_total', 'Prediction requests received.', ['route'])
+REQUEST_ERRORS = REGISTRY.counter('diamond_request_errors_total', 'Prediction requests that failed.', ['route'])
+ROWS_SCORED = REGISTRY.counter('diamond_rows_scored_total', 'Rows sent to the model.')
+ARTIFACT_LOADS = REGISTRY.counter('diamond_artifact_loads_total', 'Preprocessor/model artifact loads.')
+ARTIFACT_LOAD_SECONDS = REGISTRY.histogram(
+    'diamond_artifact_load_seconds', 'Time spent loading the preprocessor/model artifacts.',
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+)
+STAGE_SECONDS = REGISTRY.histogram(
+    'diamond_stage_seconds', 'Latency of each stage of the serving path.', ['stage']
+)
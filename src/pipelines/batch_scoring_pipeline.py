@@ -0,0 +1,210 @@
+# Import necessary libraries and modules
+import os  # Used for interacting with the operating system
+import sys  # Provides access to system-specific parameters and functions
+import time  # Used for measuring scoring throughput
+import argparse  # Parses the command line options of the scoring command
+from collections import deque  # Queue of in-flight chunks, kept in input order
+from concurrent.futures import ProcessPoolExecutor  # Scores chunks in parallel worker processes
+from dataclasses import dataclass  # Simplifies the creation of configuration classes
+import pandas as pd  # Library for working with data in DataFrame format
+from src.exception import CustomException  # Custom exception class for handling errors
+from src.logger import logging  # Custom logging module for logging information
+from src.pipelines.prediction_pipeline import CustomDataBatch, PredictPipeline
+from src.schema import (  # Input features and columns of the Parquet output
+    FEATURE_COLUMNS, NUMERICAL_COLUMNS, CATEGORICAL_COLUMNS, ID_COLUMN, TARGET_COLUMN
+)
+
+
+@dataclass
+class BatchScoringConfig:
+    # Number of rows read and scored at a time.
+    chunk_size = 100000
+    # Number of worker processes (0 scores in the current process).
+    workers = os.cpu_count() or 1
+    # Name of the column holding the predictions in the output file.
+    prediction_column = 'predicted_price'
+
+
+# PredictPipeline of the current worker process, created once by `_init_worker`.
+_worker_pipeline = None
+
+
+def _init_worker():
+    """
+    Loads the preprocessor and model once per worker process.
+    """
+    global _worker_pipeline
+    _worker_pipeline = PredictPipeline()
+    _worker_pipeline.registry.get()
+
+
+def _score_chunk(chunk):
+    """
+    Scores one chunk and returns its predictions and the number of invalid rows.
+    """
+    if _worker_pipeline is None:
+        _init_worker()
+    batch = CustomDataBatch({col: chunk[col].to_numpy() for col in FEATURE_COLUMNS})
+    predictions, errors = _worker_pipeline.predict_batch(batch)
+    return predictions, len(errors)
+
+
+class _ParquetSink:
+    """
+    Appends chunks to a Parquet file, one row group per chunk.
+
+    Every chunk is cast to the schema of the file, in which the dataset columns and the
+    predictions have fixed types. The types pandas infers can change from chunk to chunk
+    (e.g. a chunk where 'cut' is always missing reads it as float), which the Parquet writer
+    would reject. The numbers keep the 64-bit types the input is read with (not the compact
+    float32/int32 training dtypes of the schema), so the values are the same as in the CSV
+    output. Numerical values that are not numbers (rows reported invalid) are written as nulls.
+    """
+    def __init__(self, path, prediction_column):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise CustomException("Writing Parquet output requires the 'pyarrow' package", sys) from e
+        self.pa, self.pq = pa, pq
+        self.path = path
+        self.writer = None
+        self.declared_types = {
+            ID_COLUMN: pa.int64(),
+            **{col: pa.float64() for col in NUMERICAL_COLUMNS + [TARGET_COLUMN]},
+            **{col: pa.string() for col in CATEGORICAL_COLUMNS},
+            prediction_column: pa.float64()
+        }
+
+    def write(self, df):
+        # Unparsable numbers would make the cast fail, they become missing values instead
+        numeric = {col: pd.to_numeric(df[col], errors='coerce') for col in df.columns
+                   if col in self.declared_types and not self.pa.types.is_string(self.declared_types[col])
+                   and df[col].dtype == object}
+        if numeric:
+            df = df.assign(**numeric)
+        table = self.pa.Table.from_pandas(df, preserve_index=False)
+        if self.writer is None:
+            # Columns outside the dataset schema keep the types inferred from the first chunk
+            schema = self.pa.schema([
+                self.pa.field(field.name, self.declared_types.get(field.name, field.type))
+                for field in table.schema
+            ])
+            self.writer = self.pq.ParquetWriter(self.path, schema)
+        self.writer.write_table(table.cast(self.writer.schema))
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+class _CsvSink:
+    """
+    Appends chunks to a CSV file, writing the header with the first chunk only.
+    """
+    def __init__(self, path):
+        self.file = open(path, 'w', newline='')
+        self.header = True
+
+    def write(self, df):
+        df.to_csv(self.file, index=False, header=self.header)
+        self.header = False
+
+    def close(self):
+        self.file.close()
+
+
+class BatchScoringPipeline:
+    """
+    Scores large CSV files chunk by chunk with a pool of worker processes.
+
+    At most a few chunks per worker are in flight at any time, so memory stays bounded
+    whatever the size of the input file, and the output is written in input order.
+    """
+    def __init__(self, chunk_size=None, workers=None):
+        self.batch_scoring_config = BatchScoringConfig()
+        self.chunk_size = chunk_size or self.batch_scoring_config.chunk_size
+        self.workers = self.batch_scoring_config.workers if workers is None else workers
+
+    def initiate_batch_scoring(self, input_path, output_path):
+        """
+        Reads `input_path` in chunks, scores it and streams the predictions to `output_path`.
+
+        Args:
+            input_path (str): CSV file with the nine feature columns (like artifacts/test.csv).
+            output_path (str): Output file; `.parquet` writes Parquet, anything else CSV.
+
+        Returns:
+            dict: Number of rows scored, invalid rows, elapsed seconds and rows per second.
+        """
+        try:
+            logging.info("Batch scoring %s into %s (chunk_size=%d, workers=%d)",
+                         input_path, output_path, self.chunk_size, self.workers)
+            os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+            if output_path.endswith('.parquet'):
+                sink = _ParquetSink(output_path, self.batch_scoring_config.prediction_column)
+            else:
+                sink = _CsvSink(output_path)
+
+            start = time.perf_counter()
+            n_rows, n_invalid = 0, 0
+            chunks = pd.read_csv(input_path, chunksize=self.chunk_size)
+
+            def write_result(chunk, result):
+                nonlocal n_rows, n_invalid
+                predictions, invalid = result
+                chunk[self.batch_scoring_config.prediction_column] = predictions
+                sink.write(chunk)
+                n_rows += len(chunk)
+                n_invalid += invalid
+
+            try:
+                if self.workers == 0:
+                    for chunk in chunks:
+                        write_result(chunk, _score_chunk(chunk))
+                else:
+                    with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker) as pool:
+                        # Keep a bounded window of chunks in flight and write them back in order
+                        pending = deque()
+                        for chunk in chunks:
+                            pending.append((chunk, pool.submit(_score_chunk, chunk)))
+                            if len(pending) >= 2 * self.workers:
+                                chunk, future = pending.popleft()
+                                write_result(chunk, future.result())
+                        while pending:
+                            chunk, future = pending.popleft()
+                            write_result(chunk, future.result())
+            finally:
+                sink.close()
+
+            elapsed = time.perf_counter() - start
+            rows_per_second = n_rows / elapsed if elapsed > 0 else 0.0
+            logging.info("Batch scoring completed: %d rows (%d invalid) in %.2fs, %.0f rows/sec",
+                         n_rows, n_invalid, elapsed, rows_per_second)
+
+            return {
+                'rows': n_rows,
+                'invalid_rows': n_invalid,
+                'seconds': elapsed,
+                'rows_per_second': rows_per_second
+            }
+
+        except Exception as e:
+            logging.info('Exception occurred during batch scoring')
+            raise CustomException(e, sys)
+
+
+# Entry point of the script.
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Score a CSV file of diamonds with the trained model.')
+    parser.add_argument('input', help='CSV file with the nine feature columns')
+    parser.add_argument('output', help='Output file (.csv or .parquet)')
+    parser.add_argument('--chunk-size', type=int, default=BatchScoringConfig.chunk_size,
+                        help='Number of rows scored at a time')
+    parser.add_argument('--workers', type=int, default=BatchScoringConfig.workers,
+                        help='Number of worker processes (0 scores in the current process)')
+    args = parser.parse_args()
+
+    summary = BatchScoringPipeline(args.chunk_size, args.workers).initiate_batch_scoring(args.input, args.output)
+    print(f"Scored {summary['rows']} rows ({summary['invalid_rows']} invalid) "
+          f"in {summary['seconds']:.2f}s, {summary['rows_per_second']:.0f} rows/sec")
@@ -0,0 +1,218 @@
+# Import necessary libraries and modules
+import sys  # Provides access to system-specific parameters and functions
+import numpy as np  # Library for numerical operations on arrays
+from src.exception import CustomException  # Custom exception class for handling errors
+from src.logger import logging  # Custom logging module for logging information
+
+# Category labels treated as missing values (imputed with the most frequent category).
+MISSING_LABELS = ('None', 'nan')
+
+# Up to this many rows, trees are walked row by row, which avoids per-level array overhead.
+SMALL_BATCH_ROWS = 8
+
+# Larger batches are walked level by level in blocks of this many rows, small enough for
+# the per-level arrays to stay in the CPU caches.
+TREE_BLOCK_ROWS = 32768
+
+
+class FastScorer:
+    """
+    Predicts diamond prices with plain NumPy arithmetic, without pandas or scikit-learn.
+
+    It is built by `ScorerExporter` from a fitted preprocessor and model:
+    - numerical columns: median fill value, then `(x - mean) / scale`
+    - categorical columns: a lookup table from category to its encoded and scaled value
+    - linear models: the scaling is folded into the coefficients (unless the preprocessor ran in
+      float32, whose rounding must be reproduced), and the categorical lookup tables already hold
+      `coef * scaled value`, so a prediction is one dot product plus lookups
+    - tree models: the flattened node arrays of the fitted tree (int32 indices, float32
+      thresholds rounded down so every split matches, float64 leaf values), walked for all
+      rows at once
+    """
+    # Dtype the numerical columns were preprocessed in (scorers exported before the compact
+    # dataset schema do not record it and were fitted on float64)
+    numerical_dtype = np.dtype(np.float64)
+
+    def __init__(self, kind, numerical_columns, numerical_fill, numerical_mean, numerical_scale,
+                 categorical_columns, categorical_tables, categorical_fill, model_params,
+                 numerical_dtype=np.float64):
+        """
+        Initialize the scorer from the folded parameters.
+
+        Args:
+            kind (str): Either 'linear' or 'tree'.
+            numerical_columns (list): Names of the numerical columns.
+            numerical_fill (np.array): Values used for missing numerical inputs (medians).
+            numerical_mean (np.array): Offset applied to the numerical columns.
+            numerical_scale (np.array): Scale applied to the numerical columns.
+            categorical_columns (list): Names of the categorical columns.
+            categorical_tables (list): One dict per categorical column mapping category to value.
+            categorical_fill (list): Category used for missing categorical inputs.
+            model_params (dict): 'coef'/'intercept' (and 'folded') for linear models, node arrays for trees.
+            numerical_dtype (np.dtype): Dtype the preprocessor was fitted on; inputs are rounded
+                to it and scaled with the same intermediate rounding.
+        """
+        self.kind = kind
+        self.numerical_columns = list(numerical_columns)
+        self.numerical_fill = np.asarray(numerical_fill, dtype=np.float64)
+        self.numerical_mean = np.asarray(numerical_mean, dtype=np.float64)
+        self.numerical_scale = np.asarray(numerical_scale, dtype=np.float64)
+        self.categorical_columns = list(categorical_columns)
+        self.categorical_tables = [dict(table) for table in categorical_tables]
+        self.categorical_fill = list(categorical_fill)
+        self.model_params = model_params
+        self.numerical_dtype = np.dtype(numerical_dtype)
+
+    def _numerical_matrix(self, features, n_rows):
+        """
+        Returns the imputed numerical columns as an (n_rows, n_numerical) float64 matrix.
+        """
+        X = np.empty((n_rows, len(self.numerical_columns)), dtype=np.float64)
+        for j, col in enumerate(self.numerical_columns):
+            X[:, j] = np.asarray(features[col], dtype=self.numerical_dtype).ravel()
+        missing = np.isnan(X)
+        if missing.any():
+            X[missing] = np.broadcast_to(self.numerical_fill, X.shape)[missing]
+        return X
+
+    def _scale_numerical(self, X_num):
+        """
+        Standard-scales the numerical matrix exactly like the preprocessor.
+        """
+        if self.numerical_dtype == np.float64:
+            return (X_num - self.numerical_mean) / self.numerical_scale
+        # The preprocessor centres then scales in place, rounding to its dtype after each step
+        centered = (X_num - self.numerical_mean).astype(self.numerical_dtype)
+        return (centered / self.numerical_scale).astype(self.numerical_dtype).astype(np.float64)
+
+    def _lookup(self, j, values):
+        """
+        Maps the values of categorical column j through its lookup table.
+        """
+        table = self.categorical_tables[j]
+
+        # Pandas categoricals (the dataset schema): map the few categories, then index by code
+        categorical = getattr(values, 'cat', None) if hasattr(values, 'dtype') else None
+        if categorical is not None:
+            # Code -1 (missing value) picks the last entry, the value of the fill category
+            mapped = np.array([table.get(str(category), np.nan) for category in categorical.categories]
+                              + [table[self.categorical_fill[j]]], dtype=np.float64)
+            result = mapped[categorical.codes.to_numpy()]
+            if not np.isnan(result).any():
+                return result
+            values = np.asarray(values, dtype=object)  # Unknown category: reported below
+
+        values = np.asarray(values, dtype=object).ravel()
+
+        # Fast path: every value is a known category
+        try:
+            return np.fromiter(map(table.__getitem__, values), dtype=np.float64, count=values.size)
+        except (KeyError, TypeError):
+            pass
+
+        # Slow path: impute missing values and report unknown categories
+        mapped = np.empty(values.size, dtype=np.float64)
+        for k, value in enumerate(values):
+            label = str(value)
+            if label in table:
+                mapped[k] = table[label]
+            elif label in MISSING_LABELS:
+                mapped[k] = table[self.categorical_fill[j]]
+            else:
+                raise ValueError(
+                    f"Found unknown category '{label}' in column '{self.categorical_columns[j]}'"
+                )
+        return mapped
+
+    def predict(self, features):
+        """
+        Predict prices for the given rows.
+
+        Args:
+            features (dict or DataFrame): Mapping of feature name to a value or array of values.
+
+        Returns:
+            np.array: Predicted prices.
+        """
+        try:
+            n_rows = np.asarray(features[self.numerical_columns[0]]).size
+            X_num = self._numerical_matrix(features, n_rows)
+
+            if self.kind == 'linear':
+                # Coefficients on the raw (folded) or scaled numerical values, plus pre-multiplied lookups
+                params = self.model_params
+                X_lin = X_num if params.get('folded', True) else self._scale_numerical(X_num)
+                pred = X_lin @ params['coef'] + params['intercept']
+                for j, col in enumerate(self.categorical_columns):
+                    pred += self._lookup(j, features[col])
+                return pred
+
+            # Scale exactly like the preprocessor, then walk the tree for all rows at once
+            # (the tree compares float32 features, so the matrix is built in float32 directly)
+            X = np.empty((n_rows, len(self.numerical_columns) + len(self.categorical_columns)), dtype=np.float32)
+            X[:, :X_num.shape[1]] = self._scale_numerical(X_num)
+            for j, col in enumerate(self.categorical_columns):
+                X[:, X_num.shape[1] + j] = self._lookup(j, features[col])
+            return self._predict_tree(X)
+
+        except Exception as e:
+            logging.error("Exception occurred in FastScorer.predict: %s", str(e))
+            raise CustomException(e, sys)
+
+    def _tree_children(self):
+        """
+        Returns the children of every node interleaved as [right, left], leaves encoded as ~node.
+
+        One step of the walk is then a single lookup at `2 * node + (x <= threshold)`, and a
+        negative result means a leaf was reached. Built once from children_left/children_right.
+        """
+        children = getattr(self, '_children', None)
+        if children is None:
+            left, right = self.model_params['children_left'], self.model_params['children_right']
+            is_leaf = left == -1
+
+            def encode(child):
+                child = np.where(is_leaf, 0, child)  # Leaves have no children, their entries are unused
+                return np.where(is_leaf[child], ~child, child)
+
+            children = np.empty(2 * left.size, dtype=left.dtype)
+            children[0::2] = encode(right)
+            children[1::2] = encode(left)
+            self._children = children
+        return children
+
+    def _predict_tree(self, X):
+        """
+        Evaluates the flattened tree on every row: one row at a time for small batches,
+        otherwise one tree level per iteration for blocks of rows.
+        """
+        params = self.model_params
+        feature, threshold = params['feature'], params['threshold']
+        children = self._tree_children()
+        root = 0 if params['children_left'][0] != -1 else ~0
+
+        if X.shape[0] <= SMALL_BATCH_ROWS:
+            leaves = []
+            for row in X:
+                current = root
+                while current >= 0:
+                    current = children[2 * current + (row[feature[current]] <= threshold[current])]
+                leaves.append(~current)
+            return params['value'][leaves]
+
+        leaves = np.empty(X.shape[0], dtype=children.dtype)
+        for start in range(0, X.shape[0], TREE_BLOCK_ROWS):
+            block = X[start:start + TREE_BLOCK_ROWS]
+            flat, width = block.ravel(), block.shape[1]
+            rows = np.arange(block.shape[0])
+            node = np.full(block.shape[0], root, dtype=children.dtype)
+            out = leaves[start:start + TREE_BLOCK_ROWS]
+            while rows.size:
+                go_left = flat.take(rows * width + feature.take(node)) <= threshold.take(node)
+                node = children.take(2 * node + go_left)
+                # Rows that reached a leaf leave the active set
+                at_leaf = node < 0
+                if at_leaf.any():
+                    out[rows[at_leaf]] = ~node[at_leaf]
+                    rows, node = rows[~at_leaf], node[~at_leaf]
+        return params['value'][leaves]
@@ -0,0 +1,141 @@
+# Import necessary libraries and modules
+import os  # Used to detect a fork (the worker thread does not survive it)
+import sys  # Provides access to system-specific parameters and functions
+import time  # Used for the batching window
+import queue  # Hands pending requests to the batching thread
+import threading  # Runs the batching loop next to the request threads
+from concurrent.futures import Future  # Carries each caller's result back to it
+from dataclasses import dataclass  # Simplifies the creation of configuration classes
+from src.exception import CustomException  # Custom exception class for handling errors
+from src.logger import logging  # Custom logging module for logging information
+from src.pipelines.prediction_pipeline import CustomDataBatch, PredictPipeline
+from src.schema import FEATURE_COLUMNS, format_errors  # Input features and error messages of a row
+
+
+@dataclass
+class MicroBatcherConfig:
+    # Maximum number of requests scored together.
+    max_batch_size = 64
+    # Maximum time (milliseconds) the first request of a batch waits for others.
+    max_wait_ms = 2.0
+    # Upper bounds of the batch-size histogram buckets.
+    histogram_buckets = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+
+
+class MicroBatcher:
+    """
+    Coalesces concurrent single-row predictions into one vectorized call.
+
+    Request threads call `predict` with a CustomData and block on their own result. A
+    background thread takes the first waiting request, collects more for up to
+    `max_wait_ms` or until `max_batch_size` requests are waiting, scores them with one
+    `PredictPipeline.predict_batch` call and hands every caller its own row.
+    """
+    def __init__(self, pipeline=None, max_batch_size=None, max_wait_ms=None):
+        self.micro_batcher_config = MicroBatcherConfig()
+        self.pipeline = pipeline or PredictPipeline()
+        self.max_batch_size = max_batch_size or self.micro_batcher_config.max_batch_size
+        self.max_wait_ms = self.micro_batcher_config.max_wait_ms if max_wait_ms is None else max_wait_ms
+
+        self._queue = queue.Queue()
+        self._thread = None
+        self._pid = None
+        self._start_lock = threading.Lock()
+
+        # Statistics reported by `stats()`.
+        self.batches = 0
+        self.rows = 0
+        self.batch_size_histogram = {bound: 0 for bound in self.micro_batcher_config.histogram_buckets}
+        self.batch_size_histogram['+Inf'] = 0
+
+    def _ensure_started(self):
+        # Start the batching thread lazily, and again in a forked child process.
+        if self._thread is not None and self._pid == os.getpid():
+            return
+        with self._start_lock:
+            if self._thread is None or self._pid != os.getpid():
+                self._queue = queue.Queue()
+                self._pid = os.getpid()
+                self._thread = threading.Thread(target=self._run, name='micro-batcher', daemon=True)
+                self._thread.start()
+
+    def submit(self, data):
+        """
+        Queues one row for scoring.
+
+        Args:
+            data (CustomData): The row to predict on.
+
+        Returns:
+            Future: Resolves to the predicted price of the row.
+        """
+        self._ensure_started()
+        future = Future()
+        self._queue.put((data, future))
+        return future
+
+    def predict(self, data):
+        """
+        Predicts one row, scored together with the other rows waiting at the same time.
+        """
+        return self.submit(data).result()
+
+    def _collect(self):
+        # Block for the first request, then gather more until the window closes or the batch is full.
+        items = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait_ms / 1000.0
+        while len(items) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                items.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return items
+
+    def _record(self, size):
+        self.batches += 1
+        self.rows += size
+        for bound in self.micro_batcher_config.histogram_buckets:
+            if size <= bound:
+                self.batch_size_histogram[bound] += 1
+                return
+        self.batch_size_histogram['+Inf'] += 1
+
+    def _run(self):
+        while True:
+            items = self._collect()
+            self._record(len(items))
+            try:
+                batch = CustomDataBatch({
+                    col: [getattr(data, col) for data, _ in items] for col in FEATURE_COLUMNS
+                })
+                predictions, errors = self.pipeline.predict_batch(batch)
+                for row, (_, future) in enumerate(items):
+                    if row in errors:
+                        future.set_exception(CustomException(format_errors(errors[row]), sys))
+                    else:
+                        future.set_result(predictions[row])
+            except Exception as e:
+                logging.error("Exception occurred in MicroBatcher: %s", str(e))
+                for _, future in items:
+                    if not future.done():
+                        future.set_exception(e)
+
+    def stats(self):
+        """
+        Returns the configuration, queue depth and batch-size histogram of the batcher.
+
+        Returns:
+            dict: Micro-batching statistics.
+        """
+        return {
+            'max_batch_size': self.max_batch_size,
+            'max_wait_ms': self.max_wait_ms,
+            'queue_depth': self._queue.qsize(),
+            'batches': self.batches,
+            'rows': self.rows,
+            'mean_batch_size': self.rows / self.batches if self.batches else 0.0,
+            'batch_size_histogram': {str(bound): count for bound, count in self.batch_size_histogram.items()},
+        }
@@ -0,0 +1,265 @@
+# Import necessary libraries and modules
+import os  # Used for building artifact paths and reading file metadata
+import sys  # Provides access to system-specific parameters and functions
+import json  # Reads and writes the release marker
+import time  # Used for measuring artifact load times
+import pickle  # Unpickles the verified preprocessor and model
+import hashlib  # Checks the pickles against the release marker
+import threading  # Guards artifact (re)loads across request threads
+from collections import namedtuple  # Immutable container for a loaded preprocessor/model pair
+from dataclasses import dataclass  # Simplifies the creation of configuration classes
+from src.exception import CustomException  # Custom exception class for handling errors
+from src.logger import logging  # Custom logging module for logging information
+from src.serialization import load_object  # Utility function to load serialized objects (e.g., pickled files)
+from src.pipelines.stage_cache import file_fingerprint  # SHA-256 of the released pickles
+from src.pipelines.scorer_artifact import (  # Versioned, checksummed array artifact of the scorer
+    ScorerArtifactConfig, load_scorer_artifact, manifest_path
+)
+from src.metrics import ARTIFACT_LOADS, ARTIFACT_LOAD_SECONDS  # Serving metrics
+
+
+# A loaded preprocessor/model pair. It is never mutated after creation, so a request that
+# grabbed a bundle keeps using it even if the registry swaps in a newer one meanwhile.
+# Bundles loaded from the array artifact have no preprocessor: the model is a FastScorer
+# that takes the raw features.
+ModelBundle = namedtuple('ModelBundle', ['preprocessor', 'model', 'version', 'loaded_at'])
+
+
+@dataclass
+class ModelRegistryConfig:
+    # Paths of the artifacts served by the registry.
+    preprocessor_path = os.path.join('artifacts', 'preprocessor.pkl')
+    model_path = os.path.join('artifacts', 'model.pkl')
+    # Artifact format served: 'pickle' (preprocessor.pkl/model.pkl) or 'array' (the memory-mapped
+    # scorer artifact written by ScorerExporter), set with the MODEL_ARTIFACT_FORMAT variable.
+    artifact_format = os.environ.get('MODEL_ARTIFACT_FORMAT', 'pickle')
+    artifact_dir_path = ScorerArtifactConfig.artifact_dir_path
+    # Whether to check the checksum of every array file each time a new scorer artifact is loaded
+    # (reads the whole artifact once). On by default, MODEL_ARTIFACT_VERIFY=0 turns it off.
+    verify_artifact = os.environ.get('MODEL_ARTIFACT_VERIFY', '1') != '0'
+    # Release marker, written next to model.pkl once both pickles of a training run are saved.
+    release_file_name = 'model_release.json'
+    # Minimum number of seconds between two checks of the artifacts on disk.
+    check_interval = 1.0
+
+
+def release_path(model_path):
+    """
+    Returns the path of the release marker of a model pickle.
+    """
+    return os.path.join(os.path.dirname(model_path), ModelRegistryConfig.release_file_name)
+
+
+def write_model_release(preprocessor_path, model_path):
+    """
+    Marks a preprocessor/model pair as complete, once both pickles are saved.
+
+    The marker records the SHA-256 of both files and is replaced atomically. The registry
+    versions the pickles by this marker and checks them against it, so it never serves a new
+    preprocessor with an old model while a training run is rewriting the artifacts.
+
+    Args:
+        preprocessor_path (str): Path of the saved preprocessor.
+        model_path (str): Path of the saved model.
+
+    Returns:
+        str: The path of the marker.
+    """
+    marker_path = release_path(model_path)
+    release = {
+        'released_at': time.time(),
+        'preprocessor': {'file': os.path.basename(preprocessor_path), 'sha256': file_fingerprint(preprocessor_path)},
+        'model': {'file': os.path.basename(model_path), 'sha256': file_fingerprint(model_path)}
+    }
+    tmp_path = f'{marker_path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'w') as file_obj:
+        json.dump(release, file_obj, indent=2)
+    os.replace(tmp_path, marker_path)
+    logging.info('Released %s and %s', preprocessor_path, model_path)
+    return marker_path
+
+
+class ModelRegistry:
+    """
+    Loads the preprocessor/model pair once and shares it across requests and threads.
+
+    The artifacts are re-checked at most every `check_interval` seconds. Pickles are versioned
+    by their release marker (see write_model_release) and only loaded when both match it;
+    without a marker, by the files themselves. When a newer artifact is found on disk, the
+    new pair is loaded by a single thread while every other thread keeps serving the current
+    pair, and the reference is then swapped atomically.
+    """
+    def __init__(self, preprocessor_path=None, model_path=None, check_interval=None,
+                 artifact_format=None, artifact_dir_path=None):
+        self.registry_config = ModelRegistryConfig()
+        self.preprocessor_path = preprocessor_path or self.registry_config.preprocessor_path
+        self.model_path = model_path or self.registry_config.model_path
+        self.artifact_format = artifact_format or self.registry_config.artifact_format
+        self.artifact_dir_path = artifact_dir_path or self.registry_config.artifact_dir_path
+        if self.artifact_format not in ('pickle', 'array'):
+            raise CustomException(f"Unknown artifact format '{self.artifact_format}'", sys)
+        self.check_interval = (
+            self.registry_config.check_interval if check_interval is None else check_interval
+        )
+
+        self._bundle = None
+        self._next_check = 0.0
+        self._lock = threading.Lock()
+
+        # Load statistics reported by `stats()`.
+        self.load_count = 0
+        self.failed_load_count = 0
+        self.last_load_seconds = 0.0
+        self.total_load_seconds = 0.0
+
+    def _artifact_version(self):
+        """
+        Returns a version key for the artifacts on disk built from their mtime and size.
+        """
+        # The array artifact's manifest and the release marker are replaced last and atomically
+        if self.artifact_format == 'array':
+            paths = (manifest_path(self.artifact_dir_path),)
+        elif os.path.exists(release_path(self.model_path)):
+            paths = (release_path(self.model_path),)
+        else:
+            # Artifacts saved before release markers existed
+            paths = (self.preprocessor_path, self.model_path)
+        version = []
+        for path in paths:
+            stat = os.stat(path)
+            version.append((stat.st_mtime_ns, stat.st_size))
+        return tuple(version)
+
+    def _load(self, version):
+        """
+        Loads the preprocessor and model (or the scorer artifact) and publishes them as the current bundle.
+        """
+        start = time.perf_counter()
+        if self.artifact_format == 'array':
+            # Memory-mapped: mismatched and (unless verification is off) corrupted artifacts raise here
+            preprocessor, model = None, load_scorer_artifact(
+                self.artifact_dir_path, verify=self.registry_config.verify_artifact
+            )
+        elif os.path.exists(release_path(self.model_path)):
+            preprocessor, model = self._load_release()
+        else:
+            preprocessor = load_object(self.preprocessor_path)
+            model = load_object(self.model_path)
+        elapsed = time.perf_counter() - start
+
+        self._bundle = ModelBundle(preprocessor, model, version, time.time())
+        self.load_count += 1
+        self.last_load_seconds = elapsed
+        self.total_load_seconds += elapsed
+        ARTIFACT_LOADS.inc()
+        ARTIFACT_LOAD_SECONDS.observe(elapsed)
+        logging.info("Loaded %s artifacts (load #%d) in %.3fs", self.artifact_format, self.load_count, elapsed)
+        return self._bundle
+
+    def _load_release(self):
+        """
+        Loads the preprocessor and model recorded by the release marker.
+
+        Raises:
+            ValueError: If a pickle does not match the marker (a training run is rewriting it).
+        """
+        with open(release_path(self.model_path)) as file_obj:
+            release = json.load(file_obj)
+        objects = []
+        for name, path in (('preprocessor', self.preprocessor_path), ('model', self.model_path)):
+            with open(path, 'rb') as file_obj:
+                data = file_obj.read()
+            if hashlib.sha256(data).hexdigest() != release[name]['sha256']:
+                raise ValueError(f'{path} does not match its release marker, the pair is not complete yet')
+            objects.append(pickle.loads(data))
+        return tuple(objects)
+
+    def get(self):
+        """
+        Returns the current preprocessor/model bundle, loading or reloading it if needed.
+
+        Returns:
+            ModelBundle: The preprocessor/model pair to predict with.
+
+        Raises:
+            CustomException: If no bundle could be loaded.
+        """
+        bundle = self._bundle
+        now = time.monotonic()
+        if bundle is not None and now < self._next_check:
+            return bundle
+
+        if bundle is None:
+            # Nothing to serve yet: every caller waits for the first load.
+            with self._lock:
+                if self._bundle is None:
+                    try:
+                        self._bundle = self._load(self._artifact_version())
+                    except Exception as e:
+                        self.failed_load_count += 1
+                        logging.info('Exception occurred while loading artifacts in ModelRegistry')
+                        raise CustomException(e, sys)
+                    self._next_check = time.monotonic() + self.check_interval
+                return self._bundle
+
+        # A bundle is already being served: only one thread checks for a newer artifact,
+        # the others return the current bundle instead of waiting on the lock.
+        if not self._lock.acquire(blocking=False):
+            return bundle
+        try:
+            self._next_check = now + self.check_interval
+            version = self._artifact_version()
+            if version != bundle.version:
+                logging.info("Newer artifacts detected, reloading preprocessor and model")
+                bundle = self._load(version)
+        except Exception as e:
+            # Keep serving the previous pair if the new artifacts are missing or half-written.
+            self.failed_load_count += 1
+            logging.error("Reloading artifacts failed, keeping the current model: %s", str(e))
+        finally:
+            self._lock.release()
+        return bundle
+
+    def stats(self):
+        """
+        Returns load counts and load times of the registry.
+
+        Returns:
+            dict: Load statistics of the registry.
+        """
+        bundle = self._bundle
+        return {
+            'loaded': bundle is not None,
+            'artifact_format': self.artifact_format,
+            'loaded_at': bundle.loaded_at if bundle is not None else None,
+            'load_count': self.load_count,
+            'failed_load_count': self.failed_load_count,
+            'last_load_seconds': self.last_load_seconds,
+            'total_load_seconds': self.total_load_seconds,
+        }
+
+
+# Process-wide registries keyed by artifact paths, shared by every PredictPipeline.
+_registries = {}
+_registries_lock = threading.Lock()
+
+
+def get_model_registry(preprocessor_path=None, model_path=None, artifact_format=None):
+    """
+    Returns the process-wide ModelRegistry serving the given artifacts.
+
+    Args:
+        preprocessor_path (str, optional): Path of the preprocessor artifact.
+        model_path (str, optional): Path of the model artifact.
+        artifact_format (str, optional): 'pickle' or 'array' (MODEL_ARTIFACT_FORMAT by default).
+
+    Returns:
+        ModelRegistry: The shared registry for these artifacts.
+    """
+    config = ModelRegistryConfig()
+    key = (preprocessor_path or config.preprocessor_path, model_path or config.model_path,
+           artifact_format or config.artifact_format)
+    with _registries_lock:
+        if key not in _registries:
+            _registries[key] = ModelRegistry(key[0], key[1], artifact_format=key[2])
+        return _registries[key]
@@ -0,0 +1,134 @@
+# Import necessary libraries and modules
+import math  # Used to normalize missing numerical values
+import time  # Used for TTL expiry
+import threading  # Guards the cache across request threads
+from collections import OrderedDict  # Keeps entries in least recently used order
+from dataclasses import dataclass  # Simplifies the creation of configuration classes
+
+
+@dataclass
+class PredictionCacheConfig:
+    # Maximum number of cached predictions.
+    max_size = 10000
+    # Seconds after which a cached prediction expires (None keeps it until evicted).
+    ttl = None
+
+
+def normalize_key(row):
+    """
+    Returns the cache key of a row of the nine features.
+
+    Numerical values are converted to float and categorical values to stripped strings,
+    so that e.g. 1 and 1.0 hit the same entry. Missing values are normalized to None.
+    """
+    key = []
+    for value in row:
+        if isinstance(value, str):
+            key.append(value.strip())
+        elif value is None or (isinstance(value, float) and math.isnan(value)):
+            key.append(None)
+        else:
+            key.append(float(value))
+    return tuple(key)
+
+
+class PredictionCache:
+    """
+    Bounded, thread-safe LRU cache of predictions keyed on the nine-feature tuple.
+
+    Entries are tied to the version of the model that produced them: the whole cache is
+    dropped as soon as a lookup is made with a different model version.
+    """
+    def __init__(self, max_size=None, ttl=None):
+        self.prediction_cache_config = PredictionCacheConfig()
+        self.max_size = max_size or self.prediction_cache_config.max_size
+        self.ttl = self.prediction_cache_config.ttl if ttl is None else ttl
+
+        self._entries = OrderedDict()
+        self._version = None
+        self._lock = threading.Lock()
+
+        # Counters reported by `stats()`.
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def _check_version(self, version):
+        # Called with the lock held: drop every entry made by another model version.
+        if version != self._version:
+            if self._entries:
+                self.invalidations += 1
+            self._entries.clear()
+            self._version = version
+
+    def get_many(self, keys, version):
+        """
+        Looks up several keys at once.
+
+        Args:
+            keys (list): Normalized feature tuples.
+            version: Version of the model currently served.
+
+        Returns:
+            list: The cached prediction of each key, or None for a miss.
+        """
+        now = time.monotonic()
+        results = []
+        with self._lock:
+            self._check_version(version)
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is not None and self.ttl is not None and now - entry[1] > self.ttl:
+                    del self._entries[key]
+                    self.expirations += 1
+                    entry = None
+                if entry is None:
+                    self.misses += 1
+                    results.append(None)
+                else:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    results.append(entry[0])
+        return results
+
+    def put_many(self, keys, predictions, version):
+        """
+        Stores predictions made by the given model version, evicting the least recently used.
+        """
+        now = time.monotonic()
+        with self._lock:
+            self._check_version(version)
+            for key, prediction in zip(keys, predictions):
+                self._entries[key] = (prediction, now)
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """
+        Drops every cached prediction.
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """
+        Returns the cache size and its hit/miss/eviction counters.
+
+        Returns:
+            dict: Cache statistics.
+        """
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self._entries),
+            'max_size': self.max_size,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+            'invalidations': self.invalidations,
+        }
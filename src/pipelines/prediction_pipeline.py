@@ -1,17 +1,27 @@
 # Import necessary libraries and modules
 import sys  # Provides access to system-specific parameters and functions
-import os  # Used for interacting with the operating system
 from src.exception import CustomException  # Custom exception class for handling errors
 from src.logger import logging  # Custom logging module for logging information
-from src.utils import load_object  # Utility function to load serialized objects (e.g., pickled files)
+from src.pipelines.model_registry import get_model_registry  # Process-wide cache of the loaded artifacts
+from src.pipelines.prediction_cache import normalize_key  # Builds prediction cache keys
+from src.metrics import ROWS_SCORED, STAGE_SECONDS  # Serving metrics
+from src.schema import (  # Feature columns and input validation
+    NUMERICAL_COLUMNS, CATEGORICAL_COLUMNS, FEATURE_COLUMNS, apply_schema, validate_columns, format_errors
+)
+import numpy as np  # Library for numerical operations on arrays
 import pandas as pd  # Library for working with data in DataFrame format
 
 class PredictPipeline:
     """
     Handles the prediction process by utilizing pre-trained model and preprocessor artifacts.
+
+    The artifacts (pickles, or the memory-mapped scorer artifact) are loaded once per process
+    by a shared ModelRegistry, so creating a PredictPipeline per request is cheap. An optional PredictionCache is looked up first
+    and only the rows it misses are sent to the model.
     """
-    def __init__(self):
-        pass
+    def __init__(self, registry=None, cache=None):
+        self.registry = registry or get_model_registry()
+        self.cache = cache
 
     def predict(self, features):
         """
@@ -24,30 +34,88 @@ class PredictPipeline:
             pred (array-like): Predictions from the model.
         """
         try:
-            # Define file paths for the preprocessor and model artifacts
-            preprocessor_path = os.path.join('artifacts', 'preprocessor.pkl')
-            model_path = os.path.join('artifacts', 'model.pkl')
+            # Get the preprocessor and model from the registry (loaded once, reloaded when changed)
+            bundle = self.registry.get()
 
-            logging.info(f"Loading preprocessor from {preprocessor_path} and model from {model_path}.")
+            # Score frames in the dtypes the preprocessor was fitted on (no-op for schema frames)
+            if isinstance(features, pd.DataFrame):
+                features = apply_schema(features)
 
-            # Load the preprocessor and model
-            preprocessor = load_object(preprocessor_path)
-            model = load_object(model_path)
+            if self.cache is not None and isinstance(features, pd.DataFrame):
+                return self._predict_cached(bundle, features)
 
-            logging.info("Successfully loaded preprocessor and model.")
+            return self._predict_bundle(bundle, features)
 
-            # Transform the input features using the preprocessor
-            data_scaled = preprocessor.transform(features)
-            logging.info("Data transformation completed successfully.")
+        except Exception as e:
+            logging.error("Exception occurred during prediction: %s", str(e))
+            raise CustomException(e, sys)
 
-            # Make predictions using the model
-            pred = model.predict(data_scaled)
-            logging.info("Prediction completed successfully.")
-            
+    def _predict_bundle(self, bundle, features):
+        """
+        Transforms the features and predicts with the given preprocessor/model bundle.
+        """
+        if bundle.preprocessor is None:
+            # Array artifact: the scorer applies the folded preprocessing itself
+            with STAGE_SECONDS.labels(stage='model_predict').time():
+                pred = bundle.model.predict(features)
+            ROWS_SCORED.inc(len(pred))
             return pred
 
+        # Transform the input features using the preprocessor
+        with STAGE_SECONDS.labels(stage='preprocessor_transform').time():
+            data_scaled = bundle.preprocessor.transform(features)
+        logging.debug("Data transformation completed successfully.")
+
+        # Make predictions using the model
+        with STAGE_SECONDS.labels(stage='model_predict').time():
+            pred = bundle.model.predict(data_scaled)
+        ROWS_SCORED.inc(len(pred))
+        logging.debug("Prediction completed successfully.")
+
+        return pred
+
+    def _predict_cached(self, bundle, features):
+        """
+        Serves the rows found in the cache and predicts only the misses.
+        """
+        with STAGE_SECONDS.labels(stage='cache_lookup').time():
+            keys = [normalize_key(row) for row in zip(*(features[col].tolist() for col in FEATURE_COLUMNS))]
+            cached = self.cache.get_many(keys, bundle.version)
+        misses = [i for i, value in enumerate(cached) if value is None]
+
+        pred = np.array([np.nan if value is None else value for value in cached], dtype=np.float64)
+        if misses:
+            miss_pred = self._predict_bundle(bundle, features.iloc[misses])
+            pred[misses] = miss_pred
+            self.cache.put_many([keys[i] for i in misses], miss_pred.tolist(), bundle.version)
+        logging.debug("Prediction cache served %d of %d rows.", len(keys) - len(misses), len(keys))
+
+        return pred
+
+    def predict_batch(self, batch):
+        """
+        Predict prices for a whole batch with a single transform and predict call.
+
+        Args:
+            batch (CustomDataBatch): The rows to predict on.
+
+        Returns:
+            tuple: An array of predictions in input order (NaN for invalid rows) and
+                a dict mapping the index of each invalid row to its list of errors.
+        """
+        try:
+            features, errors = batch.get_data_as_dataframe()
+            predictions = np.full(len(batch), np.nan)
+
+            # Only the valid rows are sent to the model, then put back at their input position
+            if len(features):
+                predictions[features.index.to_numpy()] = self.predict(features)
+            logging.debug("Batch prediction completed: %d rows, %d invalid.", len(batch), len(errors))
+
+            return predictions, errors
+
         except Exception as e:
-            logging.error("Exception occurred during prediction: %s", str(e))
+            logging.error("Exception occurred during batch prediction: %s", str(e))
             raise CustomException(e, sys)
 
 
@@ -94,7 +162,10 @@ class CustomData:
         Convert the custom data into a Pandas DataFrame format for model prediction.
 
         Returns:
-            pd.DataFrame: A DataFrame containing the input data.
+            pd.DataFrame: A DataFrame containing the input data, with the dataset's dtypes.
+
+        Raises:
+            CustomException: If a value is missing, not a number, out of range or not a known grade.
         """
         try:
             # Create a dictionary to hold the input data
@@ -110,17 +181,110 @@ class CustomData:
                 'clarity': [self.clarity]
             }
 
-            # Convert the dictionary to a Pandas DataFrame
-            df = pd.DataFrame(custom_data_input_dict)
-            logging.info('DataFrame created successfully.')
+            # Validate and convert the dictionary to a Pandas DataFrame with float32 numerics and
+            # categorical grades, rejecting invalid values before they reach the preprocessor
+            df, errors = validate_columns(custom_data_input_dict, 1)
+            if errors:
+                raise ValueError(format_errors(errors[0]))
+            logging.debug('DataFrame created successfully.')
 
-            # Optional: Ensure the DataFrame has the correct column order (if needed for model input)
-            expected_columns = ['carat', 'depth', 'table', 'x', 'y', 'z', 'cut', 'color', 'clarity']
-            if list(df.columns) != expected_columns:
-                logging.warning(f"Column order mismatch. Expected columns: {expected_columns}, Found: {list(df.columns)}")
-            
             return df
 
         except Exception as e:
             logging.error('Exception occurred in get_data_as_dataframe method: %s', str(e))
             raise CustomException(e, sys)
+
+
+class CustomDataBatch:
+    """
+    Represents a batch of custom input data for prediction, stored column-wise.
+    """
+    def __init__(self, columns: dict):
+        """
+        Initialize the batch from column arrays of the nine features.
+
+        Args:
+            columns (dict): Mapping of feature name to a list or array of values.
+                All columns must have the same length.
+        """
+        missing_columns = [col for col in FEATURE_COLUMNS if col not in columns]
+        if missing_columns:
+            raise CustomException(f"Missing feature columns: {missing_columns}", sys)
+
+        lengths = {len(columns[col]) for col in FEATURE_COLUMNS}
+        if len(lengths) > 1:
+            raise CustomException("All feature columns must have the same length", sys)
+
+        self.columns = {col: columns[col] for col in FEATURE_COLUMNS}
+        self.n_rows = lengths.pop()
+
+    @classmethod
+    def from_records(cls, records: list):
+        """
+        Build a batch from a list of dicts, one per diamond.
+
+        Args:
+            records (list): List of dicts holding the nine features.
+
+        Returns:
+            CustomDataBatch: The batch in columnar form.
+        """
+        return cls({col: [record.get(col) for record in records] for col in FEATURE_COLUMNS})
+
+    @classmethod
+    def from_arrow(cls, record_batch):
+        """
+        Build a batch from an Arrow record batch holding the nine features, without creating
+        a Python object per row.
+
+        Numerical columns become NumPy arrays (nulls as NaN). Categorical columns become
+        pandas categoricals built from their dictionary encoding, so only the distinct
+        grades are converted and checked.
+
+        Args:
+            record_batch (pyarrow.RecordBatch): The rows to predict on.
+
+        Returns:
+            CustomDataBatch: The batch in columnar form.
+        """
+        import pyarrow as pa  # Optional dependency, only needed by Arrow clients
+        import pyarrow.compute as pc
+
+        missing_columns = [col for col in FEATURE_COLUMNS if col not in record_batch.schema.names]
+        if missing_columns:
+            raise CustomException(f"Missing feature columns: {missing_columns}", sys)
+
+        columns = {}
+        for col in NUMERICAL_COLUMNS:
+            columns[col] = record_batch.column(col).to_numpy(zero_copy_only=False)
+        for col in CATEGORICAL_COLUMNS:
+            array = record_batch.column(col)
+            if not pa.types.is_dictionary(array.type):
+                array = pc.dictionary_encode(array)
+            columns[col] = array.to_pandas()
+        return cls(columns)
+
+    def __len__(self):
+        return self.n_rows
+
+    def get_data_as_dataframe(self):
+        """
+        Convert the batch into a single columnar DataFrame, leaving out invalid rows.
+
+        Every column is validated in one vectorized pass (see validate_columns), so a
+        malformed row costs no more than a valid one and never reaches the preprocessor.
+
+        Returns:
+            tuple: A DataFrame with the valid rows (indexed by their input position) and a
+                dict mapping the index of each invalid row to its list of errors, each a dict
+                with the 'column', an error 'code' and a 'message'.
+        """
+        try:
+            df, errors = validate_columns(self.columns, self.n_rows)
+            logging.debug('Batch DataFrame created successfully.')
+
+            return df, errors
+
+        except Exception as e:
+            logging.error('Exception occurred in CustomDataBatch.get_data_as_dataframe: %s', str(e))
+            raise CustomException(e, sys)
@@ -0,0 +1,219 @@
+# Import necessary libraries and modules
+import os  # Used for building artifact paths and replacing files atomically
+import sys  # Provides access to system-specific parameters and functions
+import json  # Reads and writes the manifest
+import time  # Records when the artifact was written
+import platform  # Records the Python version that wrote the artifact
+from importlib import metadata  # Reads library versions without importing the libraries
+from dataclasses import dataclass  # Simplifies the creation of configuration classes
+import numpy as np  # Arrays are stored as .npy files and memory-mapped on load
+from src.exception import CustomException  # Custom exception class for handling errors
+from src.logger import logging  # Custom logging module for logging information
+from src.pipelines.stage_cache import file_fingerprint  # SHA-256 of the array files
+from src.pipelines.fast_scorer import FastScorer  # The object stored in the artifact
+from src.schema import (  # Feature schema the artifact must have been trained on
+    NUMERICAL_COLUMNS, CATEGORICAL_COLUMNS, CATEGORY_ORDERS
+)
+
+# Identifies the artifact format; bumped whenever the layout of the manifest changes.
+ARTIFACT_FORMAT = 'diamond-price-scorer'
+ARTIFACT_FORMAT_VERSION = 1
+
+# Libraries whose versions are recorded in the manifest.
+RECORDED_LIBRARIES = ('numpy', 'pandas', 'scikit-learn')
+
+
+@dataclass
+class ScorerArtifactConfig:
+    # Directory holding the manifest and the array files of the exported scorer.
+    artifact_dir_path = os.path.join('artifacts', 'fast_scorer')
+    # Name of the manifest inside the directory.
+    manifest_file_name = 'manifest.json'
+
+
+def _library_versions():
+    """
+    Returns the installed versions of Python and the recorded libraries.
+    """
+    versions = {'python': platform.python_version()}
+    for library in RECORDED_LIBRARIES:
+        try:
+            versions[library] = metadata.version(library)
+        except metadata.PackageNotFoundError:
+            versions[library] = None
+    return versions
+
+
+def _feature_schema():
+    """
+    Returns the feature schema the scorer expects, as recorded in the manifest.
+    """
+    return {
+        'numerical_columns': NUMERICAL_COLUMNS,
+        'categorical_columns': CATEGORICAL_COLUMNS,
+        'categories': CATEGORY_ORDERS
+    }
+
+
+def manifest_path(artifact_dir_path):
+    """
+    Returns the path of the manifest of an artifact directory.
+    """
+    return os.path.join(artifact_dir_path, ScorerArtifactConfig.manifest_file_name)
+
+
+def save_scorer_artifact(scorer, artifact_dir_path=None):
+    """
+    Writes a FastScorer as a directory of .npy arrays and a JSON manifest.
+
+    Every numeric parameter is stored as a contiguous .npy file named after its checksum.
+    The manifest holds the feature schema, the library versions, the small parameters and
+    the dtype, shape and SHA-256 of every array. It is written last and atomically, so a
+    reader always sees either the previous or the new complete artifact; array files no
+    longer referenced are then removed.
+
+    Args:
+        scorer (FastScorer): The scorer to save.
+        artifact_dir_path (str, optional): Target directory (ScorerArtifactConfig by default).
+
+    Returns:
+        str: The path of the written manifest.
+
+    Raises:
+        CustomException: If an error occurs during saving.
+    """
+    try:
+        artifact_dir_path = artifact_dir_path or ScorerArtifactConfig.artifact_dir_path
+        os.makedirs(artifact_dir_path, exist_ok=True)
+
+        arrays = {
+            'numerical_fill': scorer.numerical_fill,
+            'numerical_mean': scorer.numerical_mean,
+            'numerical_scale': scorer.numerical_scale,
+        }
+        model_scalars = {}
+        for name, value in scorer.model_params.items():
+            if isinstance(value, np.ndarray):
+                arrays[f'model.{name}'] = value
+            else:
+                model_scalars[name] = value
+
+        array_entries = {}
+        for name, array in arrays.items():
+            array = np.ascontiguousarray(array)
+            tmp_path = os.path.join(artifact_dir_path, f'.{name}.{os.getpid()}.npy')
+            np.save(tmp_path, array, allow_pickle=False)
+            checksum = file_fingerprint(tmp_path)
+            file_name = f'{name}-{checksum[:16]}.npy'
+            os.replace(tmp_path, os.path.join(artifact_dir_path, file_name))
+            array_entries[name] = {
+                'file': file_name,
+                'dtype': array.dtype.str,
+                'shape': list(array.shape),
+                'sha256': checksum
+            }
+
+        manifest = {
+            'format': ARTIFACT_FORMAT,
+            'format_version': ARTIFACT_FORMAT_VERSION,
+            'created_at': time.time(),
+            'schema': _feature_schema(),
+            'libraries': _library_versions(),
+            'scorer': {
+                'kind': scorer.kind,
+                'numerical_columns': scorer.numerical_columns,
+                'numerical_dtype': scorer.numerical_dtype.str,
+                'categorical_columns': scorer.categorical_columns,
+                'categorical_tables': scorer.categorical_tables,
+                'categorical_fill': scorer.categorical_fill,
+                'model_scalars': model_scalars
+            },
+            'arrays': array_entries
+        }
+        path = manifest_path(artifact_dir_path)
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'w') as file_obj:
+            json.dump(manifest, file_obj, indent=2)
+        os.replace(tmp_path, path)
+
+        # Remove the arrays of previous versions (readers that mapped them keep their pages)
+        referenced = {entry['file'] for entry in array_entries.values()}
+        for file_name in os.listdir(artifact_dir_path):
+            if file_name.endswith('.npy') and not file_name.startswith('.') and file_name not in referenced:
+                os.remove(os.path.join(artifact_dir_path, file_name))
+
+        logging.info('Scorer artifact written to %s (%d arrays)', artifact_dir_path, len(array_entries))
+        return path
+    except Exception as e:
+        logging.info('Exception occurred in save_scorer_artifact')
+        raise CustomException(e, sys)
+
+
+def load_scorer_artifact(artifact_dir_path=None, verify=True):
+    """
+    Loads a FastScorer written by save_scorer_artifact, memory-mapping its arrays.
+
+    The artifact is rejected before anything is served if its format version or feature
+    schema does not match this code, or if any array file does not match the dtype or shape
+    recorded in the manifest, or, unless `verify` is False, if the SHA-256 of any array file
+    does not match. The arrays are mapped read-only and shared between processes; the checksums
+    read every page once, at load time.
+
+    Args:
+        artifact_dir_path (str, optional): Artifact directory (ScorerArtifactConfig by default).
+        verify (bool): Whether to also check the SHA-256 of every array file (True by default).
+
+    Returns:
+        FastScorer: The scorer backed by the memory-mapped arrays.
+
+    Raises:
+        CustomException: If the artifact is missing, corrupted or mismatched.
+    """
+    try:
+        artifact_dir_path = artifact_dir_path or ScorerArtifactConfig.artifact_dir_path
+        with open(manifest_path(artifact_dir_path)) as file_obj:
+            manifest = json.load(file_obj)
+
+        if manifest.get('format') != ARTIFACT_FORMAT or manifest.get('format_version') != ARTIFACT_FORMAT_VERSION:
+            raise ValueError(
+                f"Unsupported artifact format {manifest.get('format')} v{manifest.get('format_version')}, "
+                f"expected {ARTIFACT_FORMAT} v{ARTIFACT_FORMAT_VERSION}"
+            )
+        if manifest['schema'] != _feature_schema():
+            raise ValueError(f"Artifact feature schema {manifest['schema']} does not match {_feature_schema()}")
+        if manifest['libraries'] != _library_versions():
+            logging.info('Scorer artifact written with %s, running with %s',
+                         manifest['libraries'], _library_versions())
+
+        arrays = {}
+        for name, entry in manifest['arrays'].items():
+            file_path = os.path.join(artifact_dir_path, entry['file'])
+            if verify and file_fingerprint(file_path) != entry['sha256']:
+                raise ValueError(f"Checksum mismatch for array '{name}' ({entry['file']})")
+            array = np.load(file_path, mmap_mode='r', allow_pickle=False)
+            if array.dtype.str != entry['dtype'] or list(array.shape) != entry['shape']:
+                raise ValueError(
+                    f"Array '{name}' is {array.dtype.str}{list(array.shape)}, "
+                    f"expected {entry['dtype']}{entry['shape']}"
+                )
+            arrays[name] = array
+
+        params = manifest['scorer']
+        model_params = dict(params['model_scalars'])
+        model_params.update({name[len('model.'):]: array for name, array in arrays.items()
+                             if name.startswith('model.')})
+        return FastScorer(
+            params['kind'],
+            params['numerical_columns'],
+            arrays['numerical_fill'],
+            arrays['numerical_mean'],
+            arrays['numerical_scale'],
+            params['categorical_columns'],
+            params['categorical_tables'],
+            params['categorical_fill'],
+            model_params,
+            numerical_dtype=np.dtype(params['numerical_dtype'])
+        )
+    except Exception as e:
+        logging.info('Exception occurred in load_scorer_artifact')
+        raise CustomException(e, sys)
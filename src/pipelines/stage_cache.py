@@ -0,0 +1,129 @@
+# Import necessary libraries and modules
+import os  # Used for interacting with the operating system
+import sys  # Provides access to system-specific parameters and functions
+import json  # Stores the recorded fingerprints on disk
+import time  # Used for measuring stage durations
+import hashlib  # Computes content fingerprints
+from dataclasses import dataclass  # Simplifies the creation of configuration classes
+from src.exception import CustomException  # Custom exception class for handling errors
+from src.logger import logging  # Custom logging module for logging information
+from src.resource_tracker import track_resources  # Measures the time and memory of each stage
+
+
+@dataclass
+class StageCacheConfig:
+    # File holding the fingerprint of the last successful run of each stage.
+    cache_file_path = os.path.join('artifacts', 'stage_cache.json')
+
+
+def file_fingerprint(file_path, block_size=1 << 20):
+    """
+    Returns the SHA-256 hex digest of a file's content.
+    """
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as file_obj:
+        for block in iter(lambda: file_obj.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def output_signature(file_path):
+    """
+    Returns the (size, modification time) of an output file, or None if it does not exist.
+    """
+    try:
+        stat = os.stat(file_path)
+    except FileNotFoundError:
+        return None
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+class StageCache:
+    """
+    Skips training pipeline stages whose inputs and configuration did not change.
+
+    A stage's fingerprint combines the content hash of its input files with its
+    configuration. When it matches the fingerprint recorded by the last successful run
+    and the stage's outputs are still the files it wrote (e.g. not overwritten by another
+    training mode), the stage is skipped and its outputs are reused. Stages that run are
+    measured with track_resources, and their measurements added to the report.
+    """
+    def __init__(self, force=False):
+        self.stage_cache_config = StageCacheConfig()
+        self.force = force
+        self.records = {}
+        self.report = []
+
+        cache_file_path = self.stage_cache_config.cache_file_path
+        if os.path.exists(cache_file_path):
+            try:
+                with open(cache_file_path) as file_obj:
+                    self.records = json.load(file_obj)
+            except ValueError:
+                logging.info('Ignoring unreadable stage cache %s', cache_file_path)
+
+    def fingerprint(self, inputs, config):
+        """
+        Returns the fingerprint of a stage from its input files and its configuration.
+
+        Args:
+            inputs (list): Paths of the files read by the stage.
+            config: JSON-serializable configuration of the stage.
+        """
+        payload = {
+            'inputs': {path: file_fingerprint(path) for path in inputs},
+            'config': config
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+    def _save(self):
+        cache_file_path = self.stage_cache_config.cache_file_path
+        os.makedirs(os.path.dirname(cache_file_path), exist_ok=True)
+        tmp_path = cache_file_path + '.tmp'
+        with open(tmp_path, 'w') as file_obj:
+            json.dump(self.records, file_obj, indent=2, sort_keys=True)
+        os.replace(tmp_path, cache_file_path)
+
+    def run_stage(self, stage, inputs, config, outputs, func):
+        """
+        Runs `func` unless the stage's fingerprint matches the last run and its outputs are unchanged.
+
+        Args:
+            stage (str): Name of the stage.
+            inputs (list): Paths of the files read by the stage.
+            config: JSON-serializable configuration of the stage.
+            outputs (list): Paths of the files written by the stage.
+            func (callable): Runs the stage.
+
+        Returns:
+            bool: True if the stage ran, False if it was skipped.
+        """
+        try:
+            start = time.perf_counter()
+            fingerprint = self.fingerprint(inputs, config)
+
+            record = self.records.get(stage)
+            if (not self.force
+                    and isinstance(record, dict)
+                    and record['fingerprint'] == fingerprint
+                    and record['outputs'] == {path: output_signature(path) for path in outputs}):
+                self.report.append({'stage': stage, 'status': 'skipped',
+                                    'seconds': time.perf_counter() - start})
+                logging.info('Stage %s skipped, inputs and config unchanged', stage)
+                return False
+
+            with track_resources(stage) as resources:
+                func()
+            self.records[stage] = {
+                'fingerprint': fingerprint,
+                'outputs': {path: output_signature(path) for path in outputs}
+            }
+            self._save()
+            self.report.append({'stage': stage, 'status': 'ran',
+                                'seconds': time.perf_counter() - start, 'resources': resources})
+            logging.info('Stage %s ran in %.2fs', stage, self.report[-1]['seconds'])
+            return True
+
+        except Exception as e:
+            logging.info('Exception occurred while running stage %s', stage)
+            raise CustomException(e, sys)
@@ -1,27 +1,169 @@
 import os  # Provides functions for interacting with the operating system.
 import sys  # Allows access to system-specific parameters and functions.
+import argparse  # Parses the command line options of the training pipeline.
 from src.logger import logging  # Custom module for logging events and processes.
 from src.exception import CustomException  # Custom module for handling exceptions.
 import pandas as pd  # Library for data manipulation and analysis.
+from sklearn import config_context  # Used to print every parameter of the preprocessor definition.
 
 # Importing custom components for the data pipeline.
 from src.components.data_ingestion import DataIngestion  # Handles data reading and splitting.
 from src.components.data_transformation import DataTransformation  # Handles data preprocessing.
 from src.components.model_trainer import ModelTrainer  # Handles model training.
+from src.components.scorer_exporter import ScorerExporter  # Exports the NumPy fast-path scorer.
+from src.components.incremental_trainer import IncrementalTrainer  # Out-of-core training on data chunks.
+from src.pipelines.stage_cache import StageCache  # Skips stages whose inputs did not change.
+from src.pipelines.scorer_artifact import manifest_path  # Manifest of the exported scorer artifact.
+from src.pipelines.model_registry import release_path  # Marker of a complete preprocessor/model pair.
+from src.schema import describe_schema  # Declared dtypes of the dataset, part of the fingerprints.
+from src.resource_tracker import track_resources, write_run_report  # Time and memory of the run.
+
+
+def describe_estimator(estimator):
+    """
+    Returns the full definition (every parameter) of an unfitted estimator, used in fingerprints.
+    """
+    with config_context(print_changed_only=False):
+        return estimator.__repr__(N_CHAR_MAX=1_000_000)
+
 
 # Entry point of the script.
 if __name__ == '__main__':
-    # Step 1: Data Ingestion
-    obj = DataIngestion()  # Create an instance of the DataIngestion class.
-    train_data_path, test_data_path = obj.initiate_data_ingestion()  # Ingest data and get paths for train/test data.
-    print(train_data_path, test_data_path)  # Display paths of the train and test datasets.
-
-    # Step 2: Data Transformation
-    data_transformation = DataTransformation()  # Create an instance of the DataTransformation class.
-    # Perform data transformation and return transformed train and test arrays.
-    train_arr, test_arr, _ = data_transformation.initiate_data_transformation(train_data_path, test_data_path)
-
-    # Step 3: Model Training
-    model_trainer = ModelTrainer()  # Create an instance of the ModelTrainer class.
-    # Train the model using the transformed train and test datasets.
-    model_trainer.initate_model_training(train_arr, test_arr)
+    parser = argparse.ArgumentParser(description='Run the training pipeline.')
+    parser.add_argument('--force', action='store_true', help='Run every stage, even if nothing changed')
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument('--search', action='store_true',
+                      help='Tune the models with a successive halving hyperparameter search')
+    mode.add_argument('--cv', action='store_true',
+                      help='Select the model with k-fold cross-validation instead of the single split')
+    mode.add_argument('--incremental', action='store_true',
+                      help='Stream the dataset in chunks and train with partial_fit, for data larger than memory')
+    parser.add_argument('--streaming-ingestion', action='store_true',
+                        help='Ingest the source in chunks and split the rows by a hash of their id')
+    parser.add_argument('--no-raw-copy', action='store_true', help='Do not write the raw.csv copy of the source')
+    args = parser.parse_args()
+
+    # Every stage that runs, and the run as a whole, is measured for the training run report.
+    with track_resources('training_run') as run_resources:
+        stage_cache = StageCache(force=args.force)  # Records a fingerprint for every stage.
+
+        if args.incremental:
+            # Steps 1-3 on a stream: sample and fit the preprocessor, then train and evaluate chunk by chunk.
+            incremental_trainer = IncrementalTrainer()  # Create an instance of the IncrementalTrainer class.
+            incremental_config = incremental_trainer.incremental_trainer_config
+            preprocessor_path = incremental_config.preprocessor_obj_file_path
+            model_path = incremental_config.trained_model_file_path
+            stage_cache.run_stage(
+                'incremental_training',
+                inputs=[incremental_config.source_data_path],
+                config={
+                    'test_size': incremental_config.test_size,
+                    'random_state': incremental_config.random_state,
+                    'chunk_size': incremental_config.chunk_size,
+                    'sample_size': incremental_config.sample_size,
+                    'n_epochs': incremental_config.n_epochs,
+                    'schema': describe_schema(),
+                    'preprocessor': describe_estimator(DataTransformation().get_data_transformation_object()),
+                    'model': describe_estimator(incremental_trainer.get_model())
+                },
+                outputs=[preprocessor_path, model_path, release_path(model_path), incremental_config.report_file_path],
+                func=incremental_trainer.initiate_incremental_training
+            )
+            # The scorer is checked on the first rows of the source, since no test file is written.
+            check_data_path = incremental_config.source_data_path
+        else:
+            # Step 1: Data Ingestion
+            obj = DataIngestion()  # Create an instance of the DataIngestion class.
+            ingestion_config = obj.ingestion_config
+            ingestion_config.streaming = args.streaming_ingestion
+            ingestion_config.save_raw_data = not args.no_raw_copy
+            train_data_path, test_data_path = ingestion_config.train_data_path, ingestion_config.test_data_path
+            stage_cache.run_stage(
+                'data_ingestion',
+                inputs=[ingestion_config.source_data_path],
+                config={'test_size': ingestion_config.test_size, 'random_state': ingestion_config.random_state,
+                        # The two modes assign the rows to different splits
+                        'split': 'hash' if ingestion_config.streaming else 'random',
+                        'save_raw_data': ingestion_config.save_raw_data, 'schema': describe_schema()},
+                outputs=[train_data_path, test_data_path]
+                        + ([ingestion_config.raw_data_path] if ingestion_config.save_raw_data else []),
+                func=obj.initiate_data_ingestion  # Ingest data and write the train/test data.
+            )
+            print(train_data_path, test_data_path)  # Display paths of the train and test datasets.
+
+            # Step 2: Data Transformation
+            data_transformation = DataTransformation()  # Create an instance of the DataTransformation class.
+            transformation_config = data_transformation.data_transformation_config
+            train_arr_paths = (transformation_config.train_features_file_path, transformation_config.train_target_file_path)
+            test_arr_paths = (transformation_config.test_features_file_path, transformation_config.test_target_file_path)
+            preprocessor_path = transformation_config.preprocessor_obj_file_path
+            stage_cache.run_stage(
+                'data_transformation',
+                inputs=[train_data_path, test_data_path],
+                config={'preprocessor': describe_estimator(data_transformation.get_data_transformation_object()),
+                        'schema': describe_schema()},
+                outputs=[*train_arr_paths, *test_arr_paths, preprocessor_path],
+                # Perform data transformation and write the transformed train and test arrays.
+                func=lambda: data_transformation.initiate_data_transformation(train_data_path, test_data_path)
+            )
+
+            # Step 3: Model Training
+            model_trainer = ModelTrainer()  # Create an instance of the ModelTrainer class.
+            trainer_config = model_trainer.model_trainer_config
+            model_path = trainer_config.trained_model_file_path
+            training_config = {'models': {name: describe_estimator(model) for name, model in model_trainer.get_models().items()}}
+            if args.search:
+                training_config['search'] = {
+                    'param_spaces': model_trainer.get_param_spaces(),
+                    'factor': trainer_config.search_factor,
+                    'cv': trainer_config.search_cv,
+                    'min_resources': trainer_config.search_min_resources,
+                    'random_state': trainer_config.random_state
+                }
+                outputs = [model_path, trainer_config.search_report_file_path]
+                # Tune the models on the memory-mapped transformed train and test datasets.
+                train_func = lambda: model_trainer.initiate_model_search(train_arr_paths, test_arr_paths)
+            elif args.cv:
+                training_config['cv'] = {
+                    'folds': trainer_config.cv_folds,
+                    'random_state': trainer_config.random_state,
+                    'preprocessor': describe_estimator(data_transformation.get_data_transformation_object())
+                }
+                outputs = [model_path, trainer_config.cv_report_file_path]
+                # Select the model by cross-validation on the training data, then fit it on the whole training set.
+                train_func = lambda: model_trainer.initiate_cross_validation(train_data_path, train_arr_paths, test_arr_paths)
+            else:
+                outputs = [model_path]
+                # Train the model on the memory-mapped transformed train and test datasets.
+                train_func = lambda: model_trainer.initate_model_training(train_arr_paths, test_arr_paths)
+            stage_cache.run_stage(
+                'model_training',
+                # The saved model is released together with this preprocessor, so a new preprocessor retrains it
+                inputs=[*train_arr_paths, *test_arr_paths, preprocessor_path] + ([train_data_path] if args.cv else []),
+                config=training_config,
+                outputs=[*outputs, release_path(model_path)],
+                func=train_func
+            )
+            check_data_path = test_data_path
+
+        # Step 4: Fast Scorer Export
+        scorer_exporter = ScorerExporter()  # Create an instance of the ScorerExporter class.
+        stage_cache.run_stage(
+            'scorer_export',
+            inputs=[preprocessor_path, model_path, check_data_path],
+            config={},
+            outputs=[scorer_exporter.scorer_exporter_config.fast_scorer_file_path,
+                     manifest_path(scorer_exporter.scorer_exporter_config.artifact_dir_path)],
+            # Fold the saved preprocessor and model into a NumPy scorer, checked against the test data.
+            func=lambda: scorer_exporter.initiate_scorer_export(preprocessor_path, model_path, check_data_path)
+        )
+
+    # Report which stages were skipped or run, with their time and memory.
+    for entry in stage_cache.report:
+        resources = entry.get('resources', {})
+        peak = f"peak RSS {resources['peak_rss_mb']:.0f} MB" if resources else ''
+        print(f"{entry['stage']:<20} {entry['status']:<8} {entry['seconds']:.2f}s {peak}")
+    mode = 'incremental' if args.incremental else 'search' if args.search else 'cv' if args.cv else 'default'
+    report_path = write_run_report({'mode': mode, 'force': args.force, 'run': run_resources,
+                                    'stages': stage_cache.report})
+    print(f'Training run report written to {report_path}')
@@ -0,0 +1,122 @@
+# Import necessary modules
+import os  # Builds the paths of the profile files
+import re  # Turns the request path into a file name
+import hmac  # Compares the profiling token in constant time
+import time  # Timestamps the profile files
+import random  # Draws the sampled requests
+import cProfile  # Deterministic profiler of the Python call stacks
+import threading  # Only one request is profiled at a time per process
+from contextlib import contextmanager  # Used to profile a block of code
+from src.logger import LOG_DIR, logging  # Log directory (the profiles go below it) and logging
+
+
+class RequestProfiler:
+    """
+    Captures a cProfile profile of selected requests and saves it as a pstats file.
+
+    A request is profiled when it carries the configured token in the X-Profile header or the
+    ?profile= query flag, or when it is drawn by the sample rate. The files are written to
+    logs/profiles/ and can be read with pstats or snakeviz. A process profiles one request at
+    a time: requests selected while another profile is running are served unprofiled.
+    """
+    header_name = 'X-Profile'
+    query_name = 'profile'
+
+    def __init__(self, token=None, sample_rate=0.0, output_dir=None, max_files=100):
+        """
+        Args:
+            token (str, optional): Secret that requests must carry to be profiled on demand.
+            sample_rate (float): Fraction of requests profiled at random (0 disables sampling).
+            output_dir (str, optional): Directory of the profile files (logs/profiles by default).
+            max_files (int): Number of profile files kept; the oldest are removed.
+        """
+        self.token = token or None
+        self.sample_rate = sample_rate
+        self.output_dir = output_dir or os.path.join(LOG_DIR, 'profiles')
+        self.max_files = max_files
+        self.profiles_written = 0
+        self.profiles_skipped = 0  # Selected while another profile was running
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return self.token is not None or self.sample_rate > 0
+
+    def should_profile(self, headers, args):
+        """
+        Returns whether a request with these headers and query arguments is to be profiled.
+        """
+        if self.token is not None:
+            supplied = headers.get(self.header_name) or args.get(self.query_name)
+            if supplied and hmac.compare_digest(supplied.encode(), self.token.encode()):
+                return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def start(self):
+        """
+        Starts profiling the calling thread.
+
+        Returns:
+            cProfile.Profile: The running profile, or None if another profile is running.
+        """
+        if not self._lock.acquire(blocking=False):
+            self.profiles_skipped += 1
+            return None
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Another profiler (e.g. a debugger) is already attached
+            self._lock.release()
+            self.profiles_skipped += 1
+            return None
+        return profile
+
+    def stop(self, profile, label):
+        """
+        Stops a profile returned by start() and writes it as a pstats file.
+
+        Args:
+            profile (cProfile.Profile): The running profile.
+            label (str): Name of the profiled work (e.g. the request path), used in the file name.
+
+        Returns:
+            str: The path of the written file.
+        """
+        try:
+            profile.disable()
+        finally:
+            self._lock.release()
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        safe_label = re.sub(r'[^A-Za-z0-9]+', '_', label).strip('_') or 'root'
+        file_name = f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{self.profiles_written}-{safe_label}.prof"
+        path = os.path.join(self.output_dir, file_name)
+        profile.dump_stats(path)
+        self.profiles_written += 1
+        logging.info("Profile of %s written to %s", label, path)
+
+        self._prune()
+        return path
+
+    def _prune(self):
+        # Keep only the newest max_files profiles
+        files = [os.path.join(self.output_dir, name) for name in os.listdir(self.output_dir) if name.endswith('.prof')]
+        if len(files) > self.max_files:
+            files.sort(key=os.path.getmtime)
+            for path in files[:len(files) - self.max_files]:
+                os.remove(path)
+
+    @contextmanager
+    def profile(self, label):
+        """
+        Profiles the enclosed block, e.g. an offline PredictPipeline call.
+        Yields a dict whose 'path' is set to the profile file once the block exits.
+        """
+        profile = self.start()
+        result = {'path': None}
+        try:
+            yield result
+        finally:
+            if profile is not None:
+                result['path'] = self.stop(profile, label)
@@ -0,0 +1,208 @@
+# Import necessary modules
+import os  # Used for building the report paths
+import sys  # Provides access to system-specific parameters and functions
+import json  # Writes the run report
+import time  # Wall-clock and CPU timers
+import tracemalloc  # Peak of the memory allocated by Python code
+from datetime import datetime  # Timestamp of the run
+from contextlib import contextmanager  # Used to measure a block of code
+from dataclasses import dataclass  # Simplifies the creation of configuration classes
+from src.logger import logging  # Custom logging module for logging information
+
+
+@dataclass
+class ResourceReportConfig:
+    # Report of the last training run, next to the model it produced.
+    report_file_path = os.path.join('artifacts', 'training_report.json')
+    # Every run is also appended here (one JSON object per line), to compare runs over time.
+    history_file_path = os.path.join('artifacts', 'training_runs.jsonl')
+    # Tracing every Python allocation slows pandas-heavy stages (e.g. writing CSV) several
+    # times over, so the stages only measure the peak Python allocation when asked to.
+    trace_python_allocations = os.environ.get('TRAINING_TRACE_ALLOCATIONS') == '1'
+
+
+# Blocks currently measured in this process, innermost last.
+_active = []
+
+
+def _max_rss_kb():
+    """
+    Returns the peak resident set size of the process over its lifetime in kB (ru_maxrss),
+    or None where getrusage is not available.
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 if sys.platform == 'darwin' else peak
+
+
+def _peak_rss_kb():
+    """
+    Returns the peak resident set size of the process in kB (VmHWM on Linux, which
+    _reset_peak_rss can reset, ru_maxrss elsewhere).
+    """
+    try:
+        with open('/proc/self/status') as file_obj:
+            for line in file_obj:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return _max_rss_kb() or 0
+
+
+def get_memory_usage():
+    """
+    Returns the memory usage of the current process in MB.
+
+    Returns:
+        dict: Current RSS, peak RSS and, on Linux, the private (not shared with a
+            parent through copy-on-write) part of the RSS.
+    """
+    peak = _max_rss_kb()
+    usage = {'rss_mb': None, 'private_mb': None, 'peak_rss_mb': peak / 2**10 if peak is not None else None}
+
+    try:
+        with open('/proc/self/smaps_rollup') as file_obj:
+            fields = dict(line.split(':', 1) for line in file_obj if ':' in line)
+        kb = lambda name: int(fields.get(name, '0 kB').split()[0])
+        usage['rss_mb'] = kb('Rss') / 2**10
+        usage['private_mb'] = (kb('Private_Clean') + kb('Private_Dirty')) / 2**10
+    except (OSError, ValueError):
+        pass
+
+    return usage
+
+
+def _reset_peak_rss():
+    """
+    Resets the peak RSS of the process to its current RSS (Linux only).
+
+    Returns:
+        bool: Whether the peak could be reset; otherwise it covers the life of the process.
+    """
+    try:
+        with open('/proc/self/clear_refs', 'w') as file_obj:
+            file_obj.write('5')
+        return True
+    except OSError:
+        return False
+
+
+class _Tracker:
+    """
+    Peaks seen so far by one measured block.
+    """
+    def __init__(self, name, tracing):
+        self.name = name
+        self.tracing = tracing
+        self.result = {}
+        self.base_python = tracemalloc.get_traced_memory()[0]
+        self.peak_python = self.base_python
+        self.peak_rss = 0
+
+    def checkpoint(self):
+        # Fold the current peaks in, before a nested block resets them
+        self.peak_python = max(self.peak_python, tracemalloc.get_traced_memory()[1])
+        self.peak_rss = max(self.peak_rss, _peak_rss_kb())
+
+
+@contextmanager
+def track_resources(name, trace_python=None):
+    """
+    Measures the wall time, CPU time, peak RSS and peak Python allocation of the enclosed block.
+
+    Yields a dict that holds the measurements once the block exits. Code running inside the
+    block can add the size of the data it processed with record_shape() and other details
+    with annotate(). Blocks can be nested: the peaks of an inner block count for the outer one.
+    CPU time covers this process only (work done in joblib worker processes is measured
+    inside the workers).
+
+    Args:
+        name (str): Name of the measured block, used in the log.
+        trace_python (bool, optional): Whether to trace the Python allocations (slow) when
+            an enclosing block is not already tracing them. Defaults to
+            ResourceReportConfig.trace_python_allocations.
+    """
+    if trace_python is None:
+        trace_python = ResourceReportConfig.trace_python_allocations
+    parent = _active[-1] if _active else None
+    if parent is not None:
+        parent.checkpoint()
+
+    started_tracing = trace_python and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    elif tracemalloc.is_tracing():
+        tracemalloc.reset_peak()
+    rss_reset = _reset_peak_rss()
+
+    tracker = _Tracker(name, tracemalloc.is_tracing())
+    _active.append(tracker)
+    start_wall, start_cpu = time.perf_counter(), time.process_time()
+    try:
+        yield tracker.result
+    finally:
+        tracker.checkpoint()
+        _active.pop()
+        if started_tracing:
+            tracemalloc.stop()
+        if parent is not None:
+            if parent.tracing:
+                parent.peak_python = max(parent.peak_python, tracker.peak_python)
+            parent.peak_rss = max(parent.peak_rss, tracker.peak_rss)
+
+        tracker.result.update({
+            'wall_seconds': time.perf_counter() - start_wall,
+            'cpu_seconds': time.process_time() - start_cpu,
+            'peak_python_mb': (tracker.peak_python - tracker.base_python) / 2**20 if tracker.tracing else None,
+            'peak_rss_mb': tracker.peak_rss / 2**10,
+            # 'process' when the peak RSS could not be reset and covers the whole process
+            'peak_rss_scope': 'block' if rss_reset else 'process'
+        })
+        logging.info('%s: %.2fs wall, %.2fs CPU, peak RSS %.1f MB, peak Python %s MB', name,
+                     tracker.result['wall_seconds'], tracker.result['cpu_seconds'],
+                     tracker.result['peak_rss_mb'], tracker.result['peak_python_mb'])
+
+
+def record_shape(rows, columns):
+    """
+    Adds `rows` rows of `columns` columns to the data processed by the innermost measured block.
+    Does nothing outside track_resources().
+    """
+    if _active:
+        result = _active[-1].result
+        result['rows'] = result.get('rows', 0) + int(rows)
+        result['columns'] = int(columns)
+
+
+def annotate(**fields):
+    """
+    Adds JSON-serializable details to the innermost measured block. Does nothing outside track_resources().
+    """
+    if _active:
+        _active[-1].result.update(fields)
+
+
+def write_run_report(report, config=None):
+    """
+    Saves the report of a training run and appends it to the run history.
+
+    Args:
+        report (dict): JSON-serializable report of the run.
+        config (ResourceReportConfig, optional): Paths of the report and the history.
+
+    Returns:
+        str: The path of the written report.
+    """
+    config = config or ResourceReportConfig()
+    report = {'timestamp': datetime.now().isoformat(timespec='seconds'), 'pid': os.getpid(), **report}
+    os.makedirs(os.path.dirname(config.report_file_path), exist_ok=True)
+    with open(config.report_file_path, 'w') as file_obj:
+        json.dump(report, file_obj, indent=2, default=str)
+    with open(config.history_file_path, 'a') as file_obj:
+        file_obj.write(json.dumps(report, default=str) + '\n')
+    return config.report_file_path
@@ -0,0 +1,262 @@
+# Declared schema of the diamond dataset, shared by ingestion, transformation and serving.
+import numpy as np  # Provides the compact numerical dtype.
+import pandas as pd  # Provides the categorical dtypes and CSV reading.
+
+# Columns of the dataset, in the order the preprocessor expects them.
+NUMERICAL_COLUMNS = ['carat', 'depth', 'table', 'x', 'y', 'z']  # Columns with numerical data.
+CATEGORICAL_COLUMNS = ['cut', 'color', 'clarity']  # Columns with categorical data.
+FEATURE_COLUMNS = NUMERICAL_COLUMNS + CATEGORICAL_COLUMNS  # Input features of the preprocessor.
+ID_COLUMN = 'id'  # Row identifier, not used as a feature.
+TARGET_COLUMN = 'price'  # Target variable.
+
+# Ranking of the categorical variables, from worst to best grade.
+CUT_CATEGORIES = ['Fair', 'Good', 'Very Good', 'Premium', 'Ideal']
+COLOR_CATEGORIES = ['D', 'E', 'F', 'G', 'H', 'I', 'J']
+CLARITY_CATEGORIES = ['I1', 'SI2', 'SI1', 'VS2', 'VS1', 'VVS2', 'VVS1', 'IF']
+CATEGORY_ORDERS = {
+    'cut': CUT_CATEGORIES,
+    'color': COLOR_CATEGORIES,
+    'clarity': CLARITY_CATEGORIES
+}
+
+# Plausible range (inclusive) of each numerical feature; prediction inputs outside it are rejected.
+# Zero x/y/z values occur in the source data (unmeasured dimensions) and are accepted.
+NUMERICAL_RANGES = {
+    'carat': (0.1, 10.0),
+    'depth': (40.0, 80.0),
+    'table': (40.0, 100.0),
+    'x': (0.0, 20.0),
+    'y': (0.0, 20.0),
+    'z': (0.0, 20.0)
+}
+
+# Compact dtypes: float32 numerics (the measurements have at most a few significant digits)
+# and ordered pandas categoricals, stored as one small integer code per row.
+NUMERICAL_DTYPE = np.float32
+CATEGORY_DTYPES = {col: pd.CategoricalDtype(CATEGORY_ORDERS[col], ordered=True) for col in CATEGORICAL_COLUMNS}
+DATASET_DTYPES = {
+    ID_COLUMN: np.int32,
+    **{col: NUMERICAL_DTYPE for col in NUMERICAL_COLUMNS},
+    **CATEGORY_DTYPES,
+    TARGET_COLUMN: NUMERICAL_DTYPE
+}
+
+# Dtypes passed to read_csv. Categorical columns are read as unconstrained categoricals, since
+# read_csv would silently turn values outside a fixed category list into missing values;
+# apply_schema then rejects them.
+_READ_DTYPES = {**DATASET_DTYPES, **{col: 'category' for col in CATEGORICAL_COLUMNS}}
+
+
+def apply_schema(df):
+    """
+    Casts the dataset columns of a DataFrame to their declared dtypes.
+
+    Columns that are not part of the schema are left as they are. Missing values are kept
+    (and imputed by the preprocessor), but categorical values outside the declared
+    categories are rejected.
+
+    Args:
+        df (pd.DataFrame): Frame holding some or all of the dataset columns.
+
+    Returns:
+        pd.DataFrame: A frame with the declared dtypes.
+
+    Raises:
+        ValueError: If a categorical column holds an unknown category.
+    """
+    columns = {}
+    for col in NUMERICAL_COLUMNS + [TARGET_COLUMN]:
+        if col in df.columns and df[col].dtype != NUMERICAL_DTYPE:
+            columns[col] = df[col].to_numpy(dtype=NUMERICAL_DTYPE)
+
+    for col in CATEGORICAL_COLUMNS:
+        if col not in df.columns:
+            continue
+        values = df[col]
+        is_categorical = isinstance(values.dtype, pd.CategoricalDtype)
+        if is_categorical and values.dtype == CATEGORY_DTYPES[col]:
+            continue
+        if is_categorical:
+            # Already categorical (e.g. read by read_csv): only its distinct values need checking
+            unknown = set(values.cat.categories) - set(CATEGORY_ORDERS[col])
+        else:
+            # One vectorized hash lookup of every value in the category list
+            array = values.to_numpy()
+            codes = CATEGORY_DTYPES[col].categories.get_indexer(array)
+            unknown = set(array[(codes == -1) & ~pd.isna(array)])
+        if unknown:
+            raise ValueError(
+                f"Unknown categories {sorted(map(str, unknown))} in column '{col}', "
+                f"expected one of {CATEGORY_ORDERS[col]}"
+            )
+        if is_categorical:
+            columns[col] = values.cat.set_categories(CATEGORY_ORDERS[col], ordered=True)
+        else:
+            columns[col] = pd.Categorical.from_codes(codes, dtype=CATEGORY_DTYPES[col])
+
+    if not columns:
+        return df
+    # Build the new frame once rather than column by column
+    return pd.DataFrame({col: columns.get(col, df[col]) for col in df.columns}, index=df.index)
+
+
+def _report(errors, valid, mask, col, code, message):
+    """
+    Marks the rows selected by `mask` as invalid and adds one error entry to each of them.
+    """
+    rows = np.flatnonzero(mask)
+    if rows.size:
+        valid[rows] = False
+        entry = {'column': col, 'code': code, 'message': message}
+        for row in rows.tolist():
+            errors.setdefault(row, []).append(entry)
+
+
+# Types of the values accepted as a single input value (bool is rejected, although it is an int).
+_SCALAR_TYPES = (str, int, float, np.integer, np.floating)
+_BOOL_TYPES = (bool, np.bool_)
+# Exact types that need no per-value check, the ones JSON, forms and CSV files produce.
+_NUMBER_TYPES = {int, float, np.float64, np.float32, np.int64, np.int32}
+_PLAIN_TYPES = _NUMBER_TYPES | {str, type(None)}
+
+
+def _as_values(raw, n_rows):
+    """
+    Returns the values of one input column as a 1-D array, and a mask of the values that are
+    not a single string or number (lists, dicts, booleans...), which are replaced by None.
+
+    Numeric arrays are returned as they are. Other inputs are converted to an object array
+    without letting NumPy unpack nested lists into extra dimensions.
+    """
+    if getattr(raw, 'dtype', None) is not None and raw.dtype.kind in 'fiu' and np.ndim(raw) == 1:
+        return np.asarray(raw), np.zeros(n_rows, dtype=bool)
+
+    types = set(map(type, raw))
+    if types <= _PLAIN_TYPES:
+        # Usual case: every value is a plain string, number or None, so NumPy can convert them at once
+        values = np.asarray(raw, dtype=np.float64 if types <= _NUMBER_TYPES else object)
+        return values, np.zeros(n_rows, dtype=bool)
+
+    values = np.fromiter(raw, dtype=object, count=n_rows)
+    invalid = np.fromiter(
+        (v is not None and v is not pd.NA and (not isinstance(v, _SCALAR_TYPES) or isinstance(v, _BOOL_TYPES))
+         for v in values),
+        dtype=bool, count=n_rows
+    )
+    values[invalid] = None
+    return values, invalid
+
+
+def validate_columns(columns, n_rows):
+    """
+    Validates raw prediction inputs column by column, with one vectorized pass per column.
+
+    Numerical columns must hold numbers within NUMERICAL_RANGES, and categorical columns
+    one of their declared grades. Every problem is reported with the column, a code
+    ('missing', 'not_a_number', 'out_of_range' or 'unknown_category') and a message.
+    Values that are not a single string or number (lists, dicts, booleans) are reported
+    as 'not_a_number' or 'unknown_category' for their row.
+
+    Args:
+        columns (dict): Mapping of each feature column to a list or array of `n_rows` values.
+        n_rows (int): Number of rows in the batch.
+
+    Returns:
+        tuple: A DataFrame with the valid rows in the declared dtypes (indexed by their
+            input position) and a dict mapping the index of each invalid row to its errors.
+    """
+    valid = np.ones(n_rows, dtype=bool)
+    errors = {}
+    data = {}
+
+    for col in NUMERICAL_COLUMNS:
+        raw, invalid = _as_values(columns[col], n_rows)
+        if raw.dtype.kind in 'fiu':
+            # Already numeric (e.g. a chunk read from CSV): only missing values are possible
+            values = raw.astype(np.float64, copy=False)
+            missing = np.isnan(values)
+            not_a_number = np.zeros(n_rows, dtype=bool)
+        else:
+            # Strings or mixed objects: unparsable values become NaN in one coercion
+            missing = (pd.isna(raw) | (raw == '')) & ~invalid
+            values = pd.to_numeric(raw, errors='coerce').astype(np.float64, copy=False)
+            not_a_number = (np.isnan(values) & ~missing) | invalid
+        low, high = NUMERICAL_RANGES[col]
+        with np.errstate(invalid='ignore'):
+            out_of_range = (values < low) | (values > high)
+        _report(errors, valid, missing, col, 'missing', f"'{col}' is required")
+        _report(errors, valid, not_a_number, col, 'not_a_number', f"'{col}' must be a number")
+        _report(errors, valid, out_of_range, col, 'out_of_range', f"'{col}' must be between {low:g} and {high:g}")
+        data[col] = values.astype(NUMERICAL_DTYPE)
+
+    for col in CATEGORICAL_COLUMNS:
+        raw = columns[col]
+        if isinstance(getattr(raw, 'dtype', None), pd.CategoricalDtype):
+            # Categorical input: recode its categories once instead of looking up every value
+            raw = pd.Categorical(raw)
+            missing = raw.isna()
+            codes = raw.set_categories(CATEGORY_ORDERS[col], ordered=True).codes
+        else:
+            raw, invalid = _as_values(raw, n_rows)
+            missing = (pd.isna(raw) | (raw == '')) & ~invalid
+            codes = CATEGORY_DTYPES[col].categories.get_indexer(raw)
+        _report(errors, valid, missing, col, 'missing', f"'{col}' is required")
+        _report(errors, valid, (codes == -1) & ~missing, col, 'unknown_category',
+                f"'{col}' must be one of {CATEGORY_ORDERS[col]}")
+        data[col] = pd.Categorical.from_codes(codes, dtype=CATEGORY_DTYPES[col])
+
+    df = pd.DataFrame(data)  # Columns already in the order the preprocessor expects
+    if errors:
+        df = df[valid]
+    return df, dict(sorted(errors.items()))
+
+
+def format_errors(row_errors):
+    """
+    Joins the errors of one row (as returned by validate_columns) into a single message.
+    """
+    return '; '.join(error['message'] for error in row_errors)
+
+
+def read_dataset(path, **kwargs):
+    """
+    Reads a dataset CSV file directly into the declared dtypes.
+
+    Args:
+        path (str): Path of the CSV file.
+        **kwargs: Extra arguments passed to pd.read_csv (e.g. nrows).
+
+    Returns:
+        pd.DataFrame: The dataset with the declared dtypes.
+
+    Raises:
+        ValueError: If a categorical column holds an unknown category.
+    """
+    return apply_schema(pd.read_csv(path, dtype=_READ_DTYPES, **kwargs))
+
+
+def iter_dataset(path, chunksize, **kwargs):
+    """
+    Reads a dataset CSV file chunk by chunk, each chunk with the declared dtypes.
+
+    Args:
+        path (str): Path of the CSV file.
+        chunksize (int): Number of rows per chunk.
+        **kwargs: Extra arguments passed to pd.read_csv (e.g. usecols).
+
+    Yields:
+        pd.DataFrame: The next chunk of the dataset.
+
+    Raises:
+        ValueError: If a categorical column holds an unknown category.
+    """
+    with pd.read_csv(path, dtype=_READ_DTYPES, chunksize=chunksize, **kwargs) as reader:
+        for chunk in reader:
+            yield apply_schema(chunk)
+
+
+def describe_schema():
+    """
+    Returns the declared dtype of every column, used in stage fingerprints.
+    """
+    return {col: repr(dtype) for col, dtype in DATASET_DTYPES.items()}
@@ -0,0 +1,103 @@
+# Saving and loading of the artifacts (pickled objects and .npy arrays).
+# Kept apart from src.utils, which imports scikit-learn and joblib for the training helpers,
+# so that the serving path can load artifacts without importing them.
+import os  # Used for building artifact paths and replacing files atomically
+import sys  # Provides access to system-specific parameters and functions
+import pickle  # Serializes Python objects
+import numpy as np  # Arrays are stored as .npy files
+from src.exception import CustomException  # Custom exception class for handling errors
+from src.logger import logging  # Custom logging module for logging information
+
+
+def save_object(file_path, obj):
+    """
+    Saves a Python object to a file using pickle.
+
+    The object is written to a temporary file that then replaces `file_path` atomically,
+    so readers never see a partially written pickle.
+
+    Args:
+        file_path (str): The path to save the object.
+        obj: The object to be saved.
+
+    Raises:
+        CustomException: If an error occurs during saving.
+    """
+    try:
+        dir_path = os.path.dirname(file_path)
+        os.makedirs(dir_path, exist_ok=True)
+
+        tmp_path = f"{file_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as file_obj:
+            pickle.dump(obj, file_obj)
+        os.replace(tmp_path, file_path)
+    except Exception as e:
+        raise CustomException(e, sys)
+
+
+def save_array(file_path, arr):
+    """
+    Saves a NumPy array to a .npy file.
+
+    Args:
+        file_path (str): The path to save the array.
+        arr (np.array): The array to be saved.
+
+    Raises:
+        CustomException: If an error occurs during saving.
+    """
+    try:
+        dir_path = os.path.dirname(file_path)
+        os.makedirs(dir_path, exist_ok=True)
+
+        np.save(file_path, np.ascontiguousarray(arr), allow_pickle=False)
+    except Exception as e:
+        raise CustomException(e, sys)
+
+
+def load_array(file_path, mmap_mode='r'):
+    """
+    Opens a .npy file, memory-mapped by default so the data is not copied into memory.
+
+    Args:
+        file_path (str): The path to the file.
+        mmap_mode (str, optional): Memory-map mode passed to np.load (None reads the file).
+
+    Returns:
+        np.array: The loaded (or memory-mapped) array.
+
+    Raises:
+        CustomException: If the file does not exist or an error occurs during loading.
+    """
+    try:
+        if not os.path.exists(file_path):
+            raise CustomException(f"File not found: {file_path}", sys)
+
+        return np.load(file_path, mmap_mode=mmap_mode, allow_pickle=False)
+    except Exception as e:
+        logging.info('Exception occurred in load_array function in serialization')
+        raise CustomException(e, sys)
+
+
+def load_object(file_path):
+    """
+    Loads a Python object from a file using pickle.
+
+    Args:
+        file_path (str): The path to the file.
+
+    Returns:
+        obj: The loaded object.
+
+    Raises:
+        CustomException: If the file does not exist or an error occurs during loading.
+    """
+    try:
+        if not os.path.exists(file_path):
+            raise CustomException(f"File not found: {file_path}", sys)
+
+        with open(file_path, 'rb') as file_obj:
+            return pickle.load(file_obj)
+    except Exception as e:
+        logging.info('Exception occurred in load_object function in serialization')
+        raise CustomException(e, sys)
@@ -1,35 +1,48 @@
-import os
 import sys
-import pickle
+import time
 import numpy as np
-import pandas as pd
+from joblib import Memory, Parallel, delayed
 from src.exception import CustomException
 from src.logger import logging
+from src.resource_tracker import track_resources, record_shape
+from sklearn.base import clone
 from sklearn.metrics import r2_score, mean_absolute_error, mean_squared_error
+from sklearn.model_selection import KFold
 
-def save_object(file_path, obj):
+def _fit_and_score(model_name, model, X_train, y_train, X_test, y_test):
     """
-    Saves a Python object to a file using pickle.
+    Fits a copy of one model and measures its fit time, predict time and resource usage.
 
-    Args:
-        file_path (str): The path to save the object.
-        obj: The object to be saved.
-
-    Raises:
-        CustomException: If an error occurs during saving.
+    Returns:
+        tuple: The model name, the fitted model and its report entry.
     """
-    try:
-        dir_path = os.path.dirname(file_path)
-        os.makedirs(dir_path, exist_ok=True)
-
-        with open(file_path, "wb") as file_obj:
-            pickle.dump(obj, file_obj)
-    except Exception as e:
-        raise CustomException(e, sys)
-
-def evaluate_model(X_train, y_train, X_test, y_test, models):
+    model = clone(model)
+    with track_resources(f'model {model_name}', trace_python=True) as resources:
+        record_shape(*X_train.shape)
+        start = time.perf_counter()
+        model.fit(X_train, y_train)
+        fit_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        y_test_pred = model.predict(X_test)
+        predict_time = time.perf_counter() - start
+
+    return model_name, model, {
+        'r2_score': r2_score(y_test, y_test_pred),
+        'fit_time': fit_time,
+        'predict_time': predict_time,
+        'peak_memory_mb': resources['peak_python_mb'],
+        'cpu_seconds': resources['cpu_seconds'],
+        'peak_rss_mb': resources['peak_rss_mb'],
+        'rows': resources['rows'],
+        'columns': resources['columns']
+    }
+
+def evaluate_model(X_train, y_train, X_test, y_test, models, n_jobs=None):
     """
-    Evaluates the performance of multiple machine learning models.
+    Evaluates the performance of multiple machine learning models, fitting them in parallel.
+
+    The models passed in are left untouched: each one is cloned and fitted in a worker.
 
     Args:
         X_train (np.array or pd.DataFrame): Training features.
@@ -37,52 +50,116 @@ def evaluate_model(X_train, y_train, X_test, y_test, models):
         X_test (np.array or pd.DataFrame): Test features.
         y_test (np.array or pd.Series): Test labels.
         models (dict): A dictionary of model names and model objects.
+        n_jobs (int, optional): Number of models fitted concurrently (-1 uses all cores).
 
     Returns:
-        dict: A dictionary containing R2 scores for each model.
+        tuple: A dictionary with the R2 score, fit time, predict time, CPU time, peak Python
+            allocation and peak RSS (MB) and training rows/columns of each model, and a
+            dictionary of the fitted models.
 
     Raises:
         CustomException: If an error occurs during model evaluation.
     """
     try:
-        report = {}
-        for model_name, model in models.items():
-            # Train the model
-            model.fit(X_train, y_train)
+        results = Parallel(n_jobs=n_jobs)(
+            delayed(_fit_and_score)(model_name, model, X_train, y_train, X_test, y_test)
+            for model_name, model in models.items()
+        )
 
-            # Predict on the test data
-            y_test_pred = model.predict(X_test)
-
-            # Calculate R2 score for the test data
-            test_model_score = r2_score(y_test, y_test_pred)
-
-            # Store the score in the report dictionary
-            report[model_name] = test_model_score
+        report = {}
+        fitted_models = {}
+        for model_name, model, model_report in results:
+            # Store the scores and timings in the report dictionary
+            report[model_name] = model_report
+            fitted_models[model_name] = model
 
-        return report
+        return report, fitted_models
     except Exception as e:
         logging.info('Exception occurred during model training')
         raise CustomException(e, sys)
 
-def load_object(file_path):
+def _transform_fold(preprocessor, X, y, train_index, val_index):
+    """
+    Fits a copy of the preprocessor on one fold's training rows and transforms both sides.
+
+    Returns:
+        tuple: Transformed training features, training target, validation features, validation target.
     """
-    Loads a Python object from a file using pickle.
+    preprocessor = clone(preprocessor)
+    X_fold_train = preprocessor.fit_transform(X.iloc[train_index])
+    X_fold_val = preprocessor.transform(X.iloc[val_index])
+    return X_fold_train, y[train_index], X_fold_val, y[val_index]
+
+def _score_fold(model_name, fold, model, X_train, y_train, X_val, y_val):
+    """
+    Fits a copy of one model on one fold and returns its validation metrics.
+    """
+    model = clone(model)
+    start = time.perf_counter()
+    model.fit(X_train, y_train)
+    fit_time = time.perf_counter() - start
+    y_val_pred = model.predict(X_val)
+    return model_name, fold, {
+        'r2_score': r2_score(y_val, y_val_pred),
+        'mae': mean_absolute_error(y_val, y_val_pred),
+        'rmse': float(np.sqrt(mean_squared_error(y_val, y_val_pred))),
+        'fit_time': fit_time
+    }
+
+def cross_validate_models(X, y, preprocessor, models, n_splits=5, n_jobs=None, cache_dir=None, random_state=42):
+    """
+    Cross-validates multiple models, fitting each fold's preprocessing only once.
+
+    Every fold's preprocessor is fitted once and its transformed matrices are shared by all
+    the candidate models. With `cache_dir`, the fold matrices are also cached on disk (keyed
+    on the data, the preprocessor and the fold) and memory-mapped, so later runs reuse them.
+    Folds are transformed in parallel, then every (model, fold) pair is fitted in parallel.
 
     Args:
-        file_path (str): The path to the file.
+        X (pd.DataFrame): Raw input features.
+        y (np.array or pd.Series): Target.
+        preprocessor: Unfitted preprocessor (e.g. from DataTransformation).
+        models (dict): A dictionary of model names and model objects.
+        n_splits (int): Number of folds.
+        n_jobs (int, optional): Number of parallel jobs (-1 uses all cores).
+        cache_dir (str, optional): Directory caching the transformed fold matrices.
+        random_state (int): Seed of the fold shuffling.
 
     Returns:
-        obj: The loaded object.
+        dict: Mean and standard deviation of R2, MAE and RMSE (and the mean fit time) per model.
 
     Raises:
-        CustomException: If the file does not exist or an error occurs during loading.
+        CustomException: If an error occurs during cross-validation.
     """
     try:
-        if not os.path.exists(file_path):
-            raise CustomException(f"File not found: {file_path}", sys)
+        y = np.asarray(y)
+        transform_fold = Memory(cache_dir, mmap_mode='r', verbose=0).cache(_transform_fold)
+        folds = list(KFold(n_splits=n_splits, shuffle=True, random_state=random_state).split(X))
+
+        # Preprocessing: once per fold, whatever the number of models
+        fold_data = Parallel(n_jobs=n_jobs)(
+            delayed(transform_fold)(preprocessor, X, y, train_index, val_index)
+            for train_index, val_index in folds
+        )
+
+        # Models: every (model, fold) pair on the shared fold matrices
+        results = Parallel(n_jobs=n_jobs)(
+            delayed(_score_fold)(model_name, fold, model, *fold_data[fold])
+            for model_name, model in models.items()
+            for fold in range(n_splits)
+        )
 
-        with open(file_path, 'rb') as file_obj:
-            return pickle.load(file_obj)
+        report = {}
+        for model_name in models:
+            fold_scores = [scores for name, _, scores in results if name == model_name]
+            report[model_name] = {}
+            for metric in ('r2_score', 'mae', 'rmse'):
+                values = np.array([scores[metric] for scores in fold_scores])
+                report[model_name][f'{metric}_mean'] = float(values.mean())
+                report[model_name][f'{metric}_std'] = float(values.std())
+            report[model_name]['fit_time_mean'] = float(np.mean([scores['fit_time'] for scores in fold_scores]))
+
+        return report
     except Exception as e:
-        logging.info('Exception occurred in load_object function in utils')
+        logging.info('Exception occurred during cross-validation')
         raise CustomException(e, sys)
@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.pipelines.batch_scoring_pipeline import _ParquetSink
+
+pq = pytest.importorskip('pyarrow.parquet')
+
+
+def test_parquet_output_keeps_input_precision(tmp_path):
+    path = str(tmp_path / 'out.parquet')
+    chunks = [
+        pd.DataFrame({
+            'id': [1, 3_000_000_000], 'carat': [0.1234567891, 1.01], 'depth': [61.123456789, 62.0],
+            'table': [55.0, 57.0], 'x': [5.1, 6.4], 'y': [5.12, 6.41], 'z': [3.123456789, 3.9],
+            'cut': ['Ideal', 'Premium'], 'color': ['E', 'G'], 'clarity': ['SI1', 'VS2'],
+            'price': [1234.56789, 4321.0], 'prediction': [1200.123456789, np.nan]
+        }),
+        # A chunk where 'cut' is always missing and 'carat' holds an unparsable value
+        pd.DataFrame({
+            'id': [2], 'carat': ['abc'], 'depth': [60.5], 'table': [56.0], 'x': [4.0], 'y': [4.1],
+            'z': [2.5], 'cut': [np.nan], 'color': ['D'], 'clarity': ['IF'], 'price': [999.99],
+            'prediction': [np.nan]
+        }),
+    ]
+    sink = _ParquetSink(path, 'prediction')
+    for chunk in chunks:
+        sink.write(chunk)
+    sink.close()
+
+    written = pq.read_table(path).to_pandas()
+    expected = pd.concat(chunks, ignore_index=True)
+    expected['carat'] = pd.to_numeric(expected['carat'], errors='coerce')
+    expected.loc[2, 'cut'] = None  # Missing strings are read back as None
+    assert written['id'].dtype == np.int64
+    assert written['carat'].dtype == np.float64
+    pd.testing.assert_frame_equal(written, expected, check_dtype=False)
@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LinearRegression, Ridge
+from sklearn.tree import DecisionTreeRegressor
+
+from src.components.data_transformation import DataTransformation
+from src.components.scorer_exporter import ScorerExporter
+from src.exception import CustomException
+from src.schema import CATEGORY_ORDERS, FEATURE_COLUMNS, NUMERICAL_COLUMNS, apply_schema
+
+
+def make_rows(n_rows, seed, missing=0.1):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        'carat': rng.uniform(0.2, 3.0, n_rows), 'depth': rng.uniform(55, 70, n_rows),
+        'table': rng.uniform(50, 70, n_rows), 'x': rng.uniform(3, 9, n_rows),
+        'y': rng.uniform(3, 9, n_rows), 'z': rng.uniform(2, 6, n_rows),
+        **{col: rng.choice(cats, n_rows) for col, cats in CATEGORY_ORDERS.items()}
+    })
+    df['price'] = 4000 * df['carat'] + 10 * df['depth'] + rng.normal(0, 100, n_rows)
+    for col in FEATURE_COLUMNS:
+        df.loc[rng.random(n_rows) < missing, col] = np.nan
+    return df[FEATURE_COLUMNS + ['price']]
+
+
+@pytest.fixture(scope='module')
+def preprocessor():
+    return DataTransformation().get_data_transformation_object().fit(apply_schema(make_rows(500, seed=0)))
+
+
+@pytest.fixture(scope='module', params=[LinearRegression, Ridge, DecisionTreeRegressor])
+def fitted(request, preprocessor):
+    train = apply_schema(make_rows(500, seed=0))
+    model = request.param().fit(preprocessor.transform(train), train['price'])
+    return preprocessor, model, ScorerExporter().build_scorer(preprocessor, model)
+
+
+def assert_same_predictions(fitted, features):
+    # The served pipeline casts the inputs to the schema dtypes before the preprocessor
+    preprocessor, model, scorer = fitted
+    expected = model.predict(preprocessor.transform(apply_schema(pd.DataFrame(features))))
+    np.testing.assert_allclose(scorer.predict(features), expected, rtol=1e-9, atol=1e-9)
+
+
+def test_schema_rows_with_missing_values(fitted):
+    # Categoricals and float32 numerics, as read with the dataset schema
+    assert_same_predictions(fitted, apply_schema(make_rows(1000, seed=1)))
+
+
+def test_plain_rows_with_missing_values(fitted):
+    # Python objects and float64, as received by the JSON endpoints
+    rows = make_rows(1000, seed=2)
+    features = {col: rows[col].astype(object).where(rows[col].notna(), None).tolist() for col in FEATURE_COLUMNS}
+    features.update({col: rows[col].to_numpy() for col in NUMERICAL_COLUMNS})
+    assert_same_predictions(fitted, features)
+
+
+def test_unseen_category_is_rejected_like_the_pipeline(fitted):
+    preprocessor, _, scorer = fitted
+    rows = make_rows(10, seed=3, missing=0)
+    features = {col: rows[col].tolist() for col in FEATURE_COLUMNS}
+    features['cut'][4] = 'Excellent'
+    with pytest.raises(ValueError, match='unknown categories'):
+        preprocessor.transform(pd.DataFrame(features))
+    with pytest.raises(CustomException, match="unknown category 'Excellent'"):
+        scorer.predict(features)
+
+    # The other rows still match once the unseen category is dropped
+    features = {col: values[:4] + values[5:] for col, values in features.items()}
+    assert_same_predictions(fitted, features)
@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+from src.schema import validate_columns
+
+VALID_ROW = {
+    'carat': 0.5, 'depth': 61.0, 'table': 55.0, 'x': 5.0, 'y': 5.0, 'z': 3.0,
+    'cut': 'Ideal', 'color': 'E', 'clarity': 'SI1'
+}
+
+
+def validate_rows(rows):
+    columns = {col: [row[col] for row in rows] for col in VALID_ROW}
+    return validate_columns(columns, len(rows))
+
+
+def test_valid_rows():
+    df, errors = validate_rows([VALID_ROW, {**VALID_ROW, 'carat': '0.7'}])
+    assert errors == {}
+    assert df['carat'].tolist() == pytest.approx([0.5, 0.7])
+
+
+@pytest.mark.parametrize('column, value, code', [
+    ('carat', [1, 2], 'not_a_number'),
+    ('carat', {'a': 1}, 'not_a_number'),
+    ('carat', True, 'not_a_number'),
+    ('carat', np.bool_(False), 'not_a_number'),
+    ('cut', ['Ideal'], 'unknown_category'),
+    ('cut', {'a': 1}, 'unknown_category'),
+    ('cut', True, 'unknown_category'),
+])
+def test_malformed_value_is_a_row_error(column, value, code):
+    df, errors = validate_rows([VALID_ROW, {**VALID_ROW, column: value}])
+    assert df.index.tolist() == [0]
+    assert errors == {1: [{'column': column, 'code': code, 'message': errors[1][0]['message']}]}
+
+
+def test_nested_lists_of_equal_length():
+    # Would otherwise be read as one 2-D array
+    df, errors = validate_rows([{**VALID_ROW, 'carat': [1, 2]}, {**VALID_ROW, 'carat': [3, 4]}])
+    assert len(df) == 0
+    assert [error['code'] for row in (0, 1) for error in errors[row]] == ['not_a_number', 'not_a_number']
+
+
+def test_missing_and_out_of_range():
+    _, errors = validate_rows([{**VALID_ROW, 'cut': None, 'carat': 50}])
+    assert sorted(error['code'] for error in errors[0]) == ['missing', 'out_of_range']